@@ -13,11 +13,27 @@ class Settings(BaseSettings):
     # OpenAI
     openai_api_key: str
     openai_model: str = "gpt-4o-mini"
+    # Small model for label extraction; a failed validation retries on openai_model
+    label_normalizer_model: str = "gpt-4o-mini"
     
     # API Base URLs
     dev_base_url: str = "https://api0.dev.nyle.ai"
     prod_base_url: str = "https://api.nyle.ai"
     
+    # Semantic cache for insight LLM calls (off by default)
+    semantic_cache_enabled: bool = False
+    embedding_model: str = "text-embedding-3-small"
+    
+    # Micro-batch concurrent label extractions into one LLM call (0 = off)
+    label_batch_window_ms: int = 0
+    
+    # SQLite file for a persistent label extraction cache ("" = in-process only)
+    label_cache_path: str = ""
+    
+    # Fetch executive summaries through the backend's /math/batch endpoint.
+    # Off until the backend exposes it; per-endpoint calls are used otherwise
+    metrics_batch_enabled: bool = False
+    
     # LangSmith (optional)
     langchain_tracing_v2: bool = False
     langchain_project: str = "nyle-chatbot"
@@ -1,61 +1,59 @@
 import re
 import logging
 
-from langchain_openai import ChatOpenAI
-
 from app.models.agentState import AgentState
 from app.config import get_settings
+from app.utils.llm import get_chat_llm
 from app.graph.nodes.classifier.prompt import (
     HARDCODED_QUESTIONS,
     INSIGHT_KEYWORDS,
+    GOAL_KEYWORDS,
+    INVENTORY_KEYWORDS,
     METRICS_VS_OTHER_PROMPT
 )
 
 logger = logging.getLogger(__name__)
 
 
-def _has_insight_keywords(question: str) -> bool:
-    """Check if question contains insight/comparison keywords."""
-    question_lower = question.lower()
-    return any(keyword in question_lower for keyword in INSIGHT_KEYWORDS)
-
-
-def _is_hardcoded(question: str) -> bool:
-    """Check if question matches a hardcoded response."""
-    question_normalized = question.lower().strip()
-    return question_normalized in HARDCODED_QUESTIONS
-
-
-def _is_goal_query(question: str) -> bool:
-    """Check if question is goal-related."""
-    question_lower = question.lower().strip()
-    goal_keywords = [
-        "goal",
-        "goals",
-        "set a goal",
-        "create goal",
-        "track goal",
-        "my goal",
-        "objective",
-        "objectives",
-        "target",
-        "targets"
-    ]
-    return any(keyword in question_lower for keyword in goal_keywords)
-
-
-def _is_inventory_query(question: str) -> bool:
-    """Check if question is inventory-related (DOI, storage fees, stockout risks)."""
-    question_lower = question.lower().strip()
-    inventory_keywords = [
-        "doi", "days of inventory", "day of inventory",
-        "storage fee", "storage fees", "storage cost",
-        "inventory", "stock", "stockout", "stock out",
-        "safety stock", "available stock", "in transit",
-        "receiving", "low stock", "out of stock",
-        "inventory turnover", "fba in-stock", "fba in stock"
-    ]
-    return any(keyword in question_lower for keyword in inventory_keywords)
+def _keyword_alternation(keywords) -> re.Pattern:
+    """
+    Compile a keyword list into one alternation regex (longest first).
+    
+    Keeps the plain substring semantics of `any(k in text for k in keywords)`
+    but scans the question once instead of once per keyword.
+    """
+    return re.compile("|".join(re.escape(k) for k in sorted(set(keywords), key=len, reverse=True)))
+
+
+# Compiled once at import instead of on every classification
+_ASIN_WORD_RE = re.compile(r'\bASINs?\b', re.IGNORECASE)
+_INSIGHT_RE = _keyword_alternation(INSIGHT_KEYWORDS)
+_GOAL_RE = _keyword_alternation(GOAL_KEYWORDS)
+_INVENTORY_RE = _keyword_alternation(INVENTORY_KEYWORDS)
+
+# The fallback prompt has a single {question} slot; split it once so each
+# call is a plain concatenation instead of re-parsing the template.
+_METRICS_VS_OTHER_PREFIX, _METRICS_VS_OTHER_SUFFIX = METRICS_VS_OTHER_PROMPT.split("{question}")
+
+
+def _has_insight_keywords(question_lower: str) -> bool:
+    """Check if the (lowercased) question contains insight/comparison keywords."""
+    return _INSIGHT_RE.search(question_lower) is not None
+
+
+def _is_hardcoded(question_lower: str) -> bool:
+    """Check if the normalized question exactly matches a hardcoded question."""
+    return question_lower in HARDCODED_QUESTIONS
+
+
+def _is_goal_query(question_lower: str) -> bool:
+    """Check if the (lowercased) question is goal-related."""
+    return _GOAL_RE.search(question_lower) is not None
+
+
+def _is_inventory_query(question_lower: str) -> bool:
+    """Check if the (lowercased) question is inventory-related (DOI, storage fees, stockout risks)."""
+    return _INVENTORY_RE.search(question_lower) is not None
 
 
 def _is_asin_query(question: str, state: AgentState) -> bool:
@@ -65,21 +63,15 @@ def _is_asin_query(question: str, state: AgentState) -> bool:
         return True
     
     # Check if question contains ASIN keyword
-    has_asin_word = bool(re.search(r'\bASINs?\b', question, re.IGNORECASE))
-    return has_asin_word
+    return _ASIN_WORD_RE.search(question) is not None
 
 
 def _classify_metrics_vs_other(question: str) -> str:
     """Use AI to classify between metrics_query and other_query."""
     settings = get_settings()
-    llm = ChatOpenAI(
-        model=settings.openai_model,
-        temperature=0,
-        api_key=settings.openai_api_key,
-        streaming=True
-    )
-    
-    prompt = METRICS_VS_OTHER_PROMPT.format(question=question)
+    llm = get_chat_llm(settings.openai_model)
+    
+    prompt = _METRICS_VS_OTHER_PREFIX + question + _METRICS_VS_OTHER_SUFFIX
     response = llm.invoke(prompt)
     question_type = response.content.strip().lower()
     
@@ -109,6 +101,9 @@ def classify_question_node(state: AgentState) -> AgentState:
     interaction_type = state.get("interaction_type", "")
     logger.info(f"Classifying: '{question}' with interaction_type: '{interaction_type}'")
     
+    # Normalize once (lowercase, collapse whitespace); every check below works on this
+    question_lower = " ".join(question.lower().split())
+    
     # 0. Check for goal-related queries or goal interaction types
     if interaction_type == "goal_created":
         logger.info("Detected goal_created interaction type")
@@ -120,13 +115,13 @@ def classify_question_node(state: AgentState) -> AgentState:
         state["question_type"] = "goal_query"
         return state
     
-    if _is_goal_query(question):
+    if _is_goal_query(question_lower):
         logger.info("Detected goal-related query")
         state["question_type"] = "goal_query"
         return state
     
     # 1. Check for inventory-related queries (DOI, storage fees, stockout risks)
-    if _is_inventory_query(question):
+    if _is_inventory_query(question_lower):
         logger.info("Detected inventory-related query")
         state["question_type"] = "inventory_query"
         return state
@@ -138,7 +133,7 @@ def classify_question_node(state: AgentState) -> AgentState:
         return state
     
     # 3. Check hardcoded (exact match)
-    if _is_hardcoded(question):
+    if _is_hardcoded(question_lower):
         question_type = "hardcoded"
         logger.info(f"Classified as hardcoded (exact match)")
         state["question_type"] = question_type
@@ -152,7 +147,7 @@ def classify_question_node(state: AgentState) -> AgentState:
         return state
     
     # 5. Check insight query
-    if state.get("compare_date_start") or _has_insight_keywords(question):
+    if state.get("compare_date_start") or _has_insight_keywords(question_lower):
         question_type = "insight_query"
         logger.info(f"Classified as insight_query (insight/comparison detected)")
         state["question_type"] = question_type
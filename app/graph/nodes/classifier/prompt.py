@@ -41,6 +41,20 @@ INSIGHT_KEYWORDS = [
     "increased",
 ]
 
+# Keywords that indicate goal queries
+GOAL_KEYWORDS = [
+    "goal",
+    "goals",
+    "set a goal",
+    "create goal",
+    "track goal",
+    "my goal",
+    "objective",
+    "objectives",
+    "target",
+    "targets",
+]
+
 # Keywords that indicate inventory/COO queries
 INVENTORY_KEYWORDS = [
     "doi",
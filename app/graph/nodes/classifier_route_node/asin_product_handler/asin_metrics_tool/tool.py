@@ -10,7 +10,9 @@ import asyncio
 import json
 import logging
 from datetime import date, timedelta
-from typing import List, Dict, Any, Set, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Set, Optional, Tuple
 
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
@@ -21,6 +23,12 @@ from app.metricsAccessLayer.products_api import products_api
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=2)
+def _today_yesterday_strs(anchor: date) -> Tuple[str, str]:
+    """ISO strings for anchor and the day before, cached per calendar day."""
+    return anchor.isoformat(), (anchor - timedelta(days=1)).isoformat()
+
+
 def is_forecasted_query(date_start: str, date_end: str) -> bool:
     """
     Check if query is for forecasted data.
@@ -28,11 +36,10 @@ def is_forecasted_query(date_start: str, date_end: str) -> bool:
     Forecasted = single day query for today or yesterday.
     Returns True if (date_start == date_end == today) or (date_start == date_end == yesterday)
     """
-    today = date.today()
-    yesterday = today - timedelta(days=1)
+    if date_start != date_end:
+        return False
     
-    today_str = today.isoformat()
-    yesterday_str = yesterday.isoformat()
+    today_str, yesterday_str = _today_yesterday_strs(date.today())
     
     is_today = (date_start == today_str and date_end == today_str)
     is_yesterday = (date_start == yesterday_str and date_end == yesterday_str)
@@ -50,14 +57,26 @@ def normalize_metric_name(name: str) -> str:
 def truncate_decimals(value: Any) -> Any:
     """
     Truncate decimal numbers to integers (cut decimals, don't round).
-    Handles floats, ints, dicts, and lists recursively.
+    Handles floats, ints, dicts, and lists.
+    
+    Nested dicts/lists are walked with an explicit stack and updated in place
+    (no recursion, no copies), so only pass data the caller owns.
     """
     if isinstance(value, float):
         return int(value)
-    elif isinstance(value, dict):
-        return {k: truncate_decimals(v) for k, v in value.items()}
-    elif isinstance(value, list):
-        return [truncate_decimals(v) for v in value]
+    if not isinstance(value, (dict, list)):
+        return value
+    
+    stack = [value]
+    while stack:
+        container = stack.pop()
+        items = container.items() if isinstance(container, dict) else enumerate(container)
+        for key, item in items:
+            # Float leaves are the common case (flat metrics payloads)
+            if isinstance(item, float):
+                container[key] = int(item)
+            elif isinstance(item, (dict, list)):
+                stack.append(item)
     return value
 
 
@@ -206,53 +225,53 @@ async def get_ranked_products(
 
 # ========== Tool 2: get_asin_metrics ==========
 
-# Mapping of metrics to their source endpoints
-METRIC_TO_ENDPOINTS = {
+# Mapping of metrics to their source endpoints (read-only, in order of preference)
+METRIC_TO_ENDPOINTS = MappingProxyType({
     # Ads endpoint metrics (also available in cfo as fallback)
-    "ad_sales": ["ads", "cfo"],
-    "ad_spend": ["ads", "cfo"],
-    "ad_clicks": ["ads", "cfo"],
-    "ad_impressions": ["ads", "cfo"],
-    "ad_units_sold": ["ads", "cfo"],
-    "ad_orders": ["ads", "cfo"],
-    "acos": ["ads", "cfo"],
-    "roas": ["ads", "cfo"],
-    "cpc": ["ads", "cfo"],
-    "cpm": ["ads", "cfo"],
-    "cac": ["ads"],
-    "ad_ctr": ["ads", "cfo"],
-    "ad_cvr": ["ads", "cfo"],
-    "time_in_budget": ["ads", "cfo"],
-    "ad_tos_is": ["ads", "cfo"],
+    "ad_sales": ("ads", "cfo"),
+    "ad_spend": ("ads", "cfo"),
+    "ad_clicks": ("ads", "cfo"),
+    "ad_impressions": ("ads", "cfo"),
+    "ad_units_sold": ("ads", "cfo"),
+    "ad_orders": ("ads", "cfo"),
+    "acos": ("ads", "cfo"),
+    "roas": ("ads", "cfo"),
+    "cpc": ("ads", "cfo"),
+    "cpm": ("ads", "cfo"),
+    "cac": ("ads",),
+    "ad_ctr": ("ads", "cfo"),
+    "ad_cvr": ("ads", "cfo"),
+    "time_in_budget": ("ads", "cfo"),
+    "ad_tos_is": ("ads", "cfo"),
     
     # Total endpoint metrics
-    "total_sales": ["total"],
-    "total_spend": ["total"],
-    "total_impressions": ["total"],
-    "ctr": ["total"],
-    "total_clicks": ["total"],
-    "cvr": ["total"],
-    "total_orders": ["total"],
-    "total_units_sold": ["total"],
-    "total_ntb_orders": ["total"],
-    "tacos": ["total"],
-    "mer": ["total"],
-    "lost_sales": ["total"],
+    "total_sales": ("total",),
+    "total_spend": ("total",),
+    "total_impressions": ("total",),
+    "ctr": ("total",),
+    "total_clicks": ("total",),
+    "cvr": ("total",),
+    "total_orders": ("total",),
+    "total_units_sold": ("total",),
+    "total_ntb_orders": ("total",),
+    "tacos": ("total",),
+    "mer": ("total",),
+    "lost_sales": ("total",),
     
     # CFO endpoint metrics
-    "gross_profit": ["cfo"],
-    "net_profit": ["cfo"],
-    "amazon_fees": ["cfo"],
-    "cost_of_goods_sold": ["cfo"],
-    "gross_margin": ["cfo"],
-    "contribution_margin": ["cfo"],
-    "roi": ["cfo"],  # moved from total to cfo only
+    "gross_profit": ("cfo",),
+    "net_profit": ("cfo",),
+    "amazon_fees": ("cfo",),
+    "cost_of_goods_sold": ("cfo",),
+    "gross_margin": ("cfo",),
+    "contribution_margin": ("cfo",),
+    "roi": ("cfo",),  # moved from total to cfo only
     
     # Inventory endpoint metrics (already supports ASIN)
-    "safety_stock": ["inventory"],
-    "inventory_turnover": ["inventory"],
-    "fba_in_stock_rate": ["inventory"],
-}
+    "safety_stock": ("inventory",),
+    "inventory_turnover": ("inventory",),
+    "fba_in_stock_rate": ("inventory",),
+})
 
 
 class ASINMetricsInput(BaseModel):
@@ -348,7 +367,7 @@ async def get_asin_metrics(
         result_metrics = {}
         for metric in metric_list:
             metric_normalized = normalize_metric_name(metric)
-            endpoints_to_try = METRIC_TO_ENDPOINTS.get(metric_normalized, [])
+            endpoints_to_try = METRIC_TO_ENDPOINTS.get(metric_normalized, ())
             
             found = False
             for endpoint in endpoints_to_try:
@@ -7,12 +7,13 @@ Handles ASIN-level queries including:
 - Simple ASIN metrics
 """
 
-from langchain_openai import ChatOpenAI
 from langchain.agents import create_agent
+from functools import lru_cache
 import logging
 
 from app.models.agentState import AgentState
 from app.config import get_settings
+from app.utils.llm import get_chat_llm
 from app.graph.nodes.classifier_route_node.asin_product_handler.prompt import (
     ASIN_PRODUCT_SYSTEM_PROMPT,
     ASIN_QUERY_TYPE_PROMPT
@@ -27,18 +28,27 @@ from app.context import set_jwt_token_for_task
 logger = logging.getLogger(__name__)
 
 
-def _classify_asin_query_type(question: str) -> str:
+@lru_cache(maxsize=4)
+def _get_asin_product_agent(model: str):
+    """Build (once per model) the ASIN metrics agent; its prompt and tools are static."""
+    prompt_with_templates = ASIN_PRODUCT_SYSTEM_PROMPT.format(
+        templates=format_templates_for_prompt()
+    )
+    
+    return create_agent(
+        get_chat_llm(model),
+        tools=[get_ranked_products, get_asin_metrics],
+        system_prompt=prompt_with_templates
+    )
+
+
+async def _classify_asin_query_type(question: str) -> str:
     """Sub-classify ASIN query type using LLM."""
     settings = get_settings()
-    llm = ChatOpenAI(
-        model=settings.openai_model,
-        temperature=0,
-        api_key=settings.openai_api_key,
-        streaming=True
-    )
+    llm = get_chat_llm(settings.openai_model)
     
     prompt = ASIN_QUERY_TYPE_PROMPT.format(question=question)
-    response = llm.invoke(prompt)
+    response = await llm.ainvoke(prompt)
     query_type = response.content.strip().lower()
     
     # Validate query_type
@@ -69,7 +79,7 @@ async def asin_product_handler_node(state: AgentState) -> AgentState:
     logger.info(f"Date: {state['date_start']} to {state['date_end']}")
     
     # 1. Sub-classify ASIN query type
-    query_type = _classify_asin_query_type(question)
+    query_type = await _classify_asin_query_type(question)
     logger.info(f"ASIN query type: {query_type}")
     
     # 2. Route to appropriate handler
@@ -84,24 +94,7 @@ async def asin_product_handler_node(state: AgentState) -> AgentState:
     # 3. Otherwise, proceed with normal ASIN metrics agent
     settings = get_settings()
     
-    # Build prompt with templates injected
-    prompt_with_templates = ASIN_PRODUCT_SYSTEM_PROMPT.format(
-        templates=format_templates_for_prompt()
-    )
-    
-    llm = ChatOpenAI(
-        model=settings.openai_model,
-        temperature=0,
-        api_key=settings.openai_api_key,
-        streaming=True
-    )
-    
-    # Create agent with ASIN-aware tools
-    agent = create_agent(
-        llm,
-        tools=[get_ranked_products, get_asin_metrics],
-        system_prompt=prompt_with_templates
-    )
+    agent = _get_asin_product_agent(settings.openai_model)
     
     logger.info("Running ASIN product query agent...")
     
@@ -4,17 +4,19 @@ from app.models.agentState import AgentState
 
 logger = logging.getLogger(__name__)
 
+# Hardcoded dashboard message (built once at import, shared by every call)
+DASHBOARD_RESPONSE = """Welcome to Nyle. We are the world's first AI-powered Operating System for Autonomous eCommerce Development."""
+
 
 async def dashboard_load_handler_node(state: AgentState) -> AgentState:
     """
     Handler for dashboard_load interaction type.
     
-    Returns hardcoded store overview and insights.
+    Returns hardcoded store overview and insights. No I/O is awaited; the node
+    stays async only to match the other handler nodes.
     """
     logger.info("Processing dashboard_load interaction")
     
-    # Hardcoded dashboard message
-    state["response"] = """Welcome to Nyle. We are the world's first AI-powered Operating System for Autonomous eCommerce Development."""
+    state["response"] = DASHBOARD_RESPONSE
     
     return state
-
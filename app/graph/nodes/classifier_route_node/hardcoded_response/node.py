@@ -1,26 +1,16 @@
 import logging
+from types import MappingProxyType
+from typing import Final
 
 from app.models.agentState import AgentState
 
 logger = logging.getLogger(__name__)
 
 
-def hardcoded_response_node(state: AgentState) -> AgentState:
-    """
-    Handler for hardcoded responses (special questions).
-    
-    Handles:
-    - Performance insights
-    - Highest performance day
-    - Other pre-defined responses
-    """
-    
-    logger.info(f"Processing hardcoded query: '{state['question']}'")
-    
-    question_lower = state["question"].lower().strip()
+# ========== Hardcoded responses (built once at import) ==========
+# Final: never reassigned; handlers only copy the reference into state.
 
-    if "show me some insights about this product from oct 1 to oct 30" in question_lower:
-        state["response"] = """Performance Insights
+PRODUCT_OCT_INSIGHTS_RESPONSE: Final[str] = """Performance Insights
 
 I've conducted a comprehensive analysis of your store's performance data spanning from October 1, 2025 to October 31, 2025 for asin B0160HYB8S. I'd like to share some important findings with you:
 
@@ -37,12 +27,10 @@ ACOS: 23%
 
 Would you like me to update this goal for you?"""
 
-    elif question_lower == "yes":
-        state["response"] = """You're goal for Nov 1-15, 2025 is set to
+GOAL_CONFIRMATION_RESPONSE: Final[str] = """You're goal for Nov 1-15, 2025 is set to
 ACOS: 23%"""
 
-    elif "compare my store performance in august over august to september" in question_lower:
-        state["response"] = """Performance Insights:
+AUG_SEP_COMPARISON_RESPONSE: Final[str] = """Performance Insights:
 
 Strongest improvement happens during Sep 01 to 05, 2025 and this is because you optimized your ACOS (advertising cost of sale) to 20% during that period
 Your net profit increased by 9.2% from August to September, and this is because you reduced your TOS IS (Top of Search Impression Share) from 18% in late August to 15% on Sep 07, 2025
@@ -50,21 +38,68 @@ Your net profit increased by 9.2% from August to September, and this is because
 Your store also has optimization potential:
 You could have made $48,290 (net profit gain) (that's a 15% increase) from Aug 15 to Sep 30, 2025, if you had adjusted your ACOS to 20% and TOS IS to 7.8% at Aug 15, 2025"""
 
-    elif "performance insight" in question_lower or "performance compare" in question_lower:
-        state["response"] = """Performance Insights:
+PERFORMANCE_INSIGHTS_RESPONSE: Final[str] = """Performance Insights:
 
 - Strongest improvement during Sep 01-05, 2025 (optimized ACOS to 20%)
 - Net profit increased 9.2% from August to September (reduced TOS IS from 18% to 15%)
 
 Optimization potential: You could have made $48,290 additional net profit (15% increase) from Aug 15 to Sep 30, 2025, if you had adjusted ACOS to 20% and TOS IS to 7-8%."""
 
-    elif "highest performance" in question_lower:
-        state["response"] = "Your highest performance day in September was Sep 2, 2025"
+HIGHEST_PERFORMANCE_RESPONSE: Final[str] = "Your highest performance day in September was Sep 2, 2025"
+
+FALLBACK_RESPONSE: Final[str] = "I'm not sure how to answer that question. Please try rephrasing."
+
+
+# Exact questions (lowercased, whitespace-collapsed) -> response. The classifier
+# only routes questions in HARDCODED_QUESTIONS here, so this is the common path.
+EXACT_RESPONSES = MappingProxyType({
+    "can you show me some insights about this product from oct 1 to oct 30": PRODUCT_OCT_INSIGHTS_RESPONSE,
+    "yes": GOAL_CONFIRMATION_RESPONSE,
+    "can you compare my store performance in august over august to september?": AUG_SEP_COMPARISON_RESPONSE,
+    "show me performance insights": PERFORMANCE_INSIGHTS_RESPONSE,
+    "give me performance insights": PERFORMANCE_INSIGHTS_RESPONSE,
+    "what was the highest performance day?": HIGHEST_PERFORMANCE_RESPONSE,
+})
+
+# Substring fallback, checked in priority order
+KEYWORD_RESPONSES = (
+    ("show me some insights about this product from oct 1 to oct 30", PRODUCT_OCT_INSIGHTS_RESPONSE),
+    ("compare my store performance in august over august to september", AUG_SEP_COMPARISON_RESPONSE),
+    ("performance insight", PERFORMANCE_INSIGHTS_RESPONSE),
+    ("performance compare", PERFORMANCE_INSIGHTS_RESPONSE),
+    ("highest performance", HIGHEST_PERFORMANCE_RESPONSE),
+)
+
+
+def _lookup_response(question_lower: str) -> str:
+    """Resolve a normalized question to its hardcoded response."""
+    response = EXACT_RESPONSES.get(question_lower)
+    if response is not None:
+        return response
+    
+    for keyword, response in KEYWORD_RESPONSES:
+        if keyword in question_lower:
+            return response
+    
+    return FALLBACK_RESPONSE
+
 
-    else:
-        state["response"] = "I'm not sure how to answer that question. Please try rephrasing."
+def hardcoded_response_node(state: AgentState) -> AgentState:
+    """
+    Handler for hardcoded responses (special questions).
+    
+    Handles:
+    - Performance insights
+    - Highest performance day
+    - Other pre-defined responses
+    """
+    
+    logger.info("Processing hardcoded query: '%s'", state['question'])
+    
+    # Same normalization as the classifier, so exact matches line up
+    question_lower = " ".join(state["question"].lower().split())
+    state["response"] = _lookup_response(question_lower)
     
     logger.info("Returned hardcoded response")
     
     return state
-
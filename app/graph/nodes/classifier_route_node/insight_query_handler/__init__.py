@@ -0,0 +1,3 @@
+from .node import insight_query_handler_node
+
+__all__ = ["insight_query_handler_node"]
@@ -1,12 +1,24 @@
+import asyncio
 import logging
-from datetime import datetime, timedelta
+import re
+from functools import lru_cache
+from datetime import date, timedelta
+from typing import Any, Literal, Optional
 
-from langchain_openai import ChatOpenAI
+import orjson
+
+from langchain_core.callbacks import adispatch_custom_event
+from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import BaseModel, Field
 
 from app.models.agentState import AgentState
 from app.config import get_settings
+from app.utils.llm import get_chat_llm
 from app.metricsAccessLayer import metrics_api
+from app.utils.date_calculator import format_date_range
 from app.context import set_jwt_token_for_task
+from app.utils.semantic_cache import SemanticCache, scope_key
+from app.utils.metrics_payload import locate_metrics_payload
 from app.graph.nodes.classifier_route_node.insight_query_handler.prompt import (
     INSIGHT_INTENT_PROMPT,
     COMPARISON_EXPLANATION_PROMPT
@@ -14,71 +26,174 @@ from app.graph.nodes.classifier_route_node.insight_query_handler.prompt import (
 
 logger = logging.getLogger(__name__)
 
+# Unambiguous phrasings resolve without an LLM call. A question is only
+# fast-pathed when exactly one intent matches; anything else goes to the LLM.
+# Net profit alone is not a loss question ("show net profit trend"), and "why"
+# questions may be trend analysis or a comparison, so both go to the LLM.
+_INTENT_PATTERNS = (
+    (re.compile(r"\b(profit loss(es)?|non[- ]optimal|wasted|lose on ads|lost on ads|lose money|lost money)\b", re.I), "net_profit_loss"),
+    (re.compile(r"\b(trends?|trending|day by day|what happened)\b", re.I), "trend_analysis"),
+    (re.compile(r"\b(compare|compared|comparison|vs|versus|changed? from)\b", re.I), "comparison"),
+)
+_WHY_RE = re.compile(r"\bwhy\b", re.I)
+
+# Comparisons of a single named metric are a fixed-format delta table and are
+# answered without the LLM, unless the question asks for reasons. Only metrics
+# of the ads summary the pipeline fetches qualify, so bare "sales"/"orders"/
+# "spend" (which may mean totals) and TACoS (total endpoint) go to the LLM.
+_ANALYSIS_RE = re.compile(r"\b(why|explain|reasons?|causes?|caused|drivers?|driving)\b", re.I)
+_COMPARISON_METRICS = (
+    # The ads executive summary reports ACOS and Ad TOS IS as fractions
+    # (acos 0.2656 = 26.56%); "percent" metrics are scaled by 100 for display
+    (re.compile(r"\bacos\b", re.I), "acos", "percent"),
+    (re.compile(r"\broas\b", re.I), "roas", "ratio"),
+    (re.compile(r"\bcpc\b", re.I), "cpc", "currency"),
+    (re.compile(r"\b(ad[ _])?tos[ _]is\b|\btop of search\b", re.I), "ad_tos_is", "percent"),
+    (re.compile(r"\bad[ _]sales\b", re.I), "ad_sales", "currency"),
+    (re.compile(r"\bad[ _]spend\b", re.I), "ad_spend", "currency"),
+    (re.compile(r"\bad[ _]clicks\b", re.I), "ad_clicks", "count"),
+    (re.compile(r"\bad[ _]impressions\b", re.I), "ad_impressions", "count"),
+    (re.compile(r"\bad[ _]orders\b", re.I), "ad_orders", "count"),
+)
+
+# Paraphrased questions ("compare Aug vs Sep" / "how did Sep do vs Aug") reuse
+# earlier LLM results. Explanations are additionally scoped to the exact data.
+_INTENT_CACHE = SemanticCache("insight_intent", threshold=0.95)
+_EXPLANATION_CACHE = SemanticCache("comparison_explanation", threshold=0.95)
+
 
-def _classify_insight_intent(question: str) -> str:
-    """Sub-classify the insight intent using LLM."""
-    settings = get_settings()
-    llm = ChatOpenAI(
-        model=settings.openai_model,
-        temperature=0,
-        api_key=settings.openai_api_key,
-        streaming=True
+class InsightIntent(BaseModel):
+    """Structured output for insight sub-classification."""
+    
+    intent: Literal["net_profit_loss", "comparison", "trend_analysis"] = Field(
+        description="Insight type of the question"
     )
+
+
+@lru_cache(maxsize=4)
+def _get_intent_llm(model: str):
+    """Build (once per model) the ChatOpenAI client bound to InsightIntent output."""
+    # Server-enforced enum: the model can only emit one of the three labels
+    return get_chat_llm(model).with_structured_output(InsightIntent, method="json_schema", strict=True)
+
+
+def _match_insight_intent(question: str) -> Optional[str]:
+    """Regex fast path: the intent if exactly one pattern matches, else None."""
+    if _WHY_RE.search(question):
+        return None
+    matched = {intent for pattern, intent in _INTENT_PATTERNS if pattern.search(question)}
+    return matched.pop() if len(matched) == 1 else None
+
+
+async def _classify_insight_intent(question: str) -> str:
+    """Sub-classify the insight intent using the semantic cache, then the LLM."""
+    embedding = await _INTENT_CACHE.aembed(question)
+    cached = _INTENT_CACHE.lookup(embedding)
+    if cached is not None:
+        return cached
     
-    prompt = INSIGHT_INTENT_PROMPT.format(question=question)
-    response = llm.invoke(prompt)
-    intent = response.content.strip().lower()
+    llm = _get_intent_llm(get_settings().openai_model)
     
-    # Validate intent
-    if intent not in ["net_profit_loss", "comparison", "trend_analysis"]:
-        logger.warning(f"Invalid insight intent '{intent}', defaulting to comparison")
-        intent = "comparison"
+    prompt = INSIGHT_INTENT_PROMPT.format(question=question)
+    intent = (await llm.ainvoke(prompt)).intent
     
+    _INTENT_CACHE.store(embedding, intent)
     return intent
 
 
 def _derive_comparison_period(date_start: str, date_end: str) -> tuple[str, str]:
     """Derive the previous same-length period for comparison."""
-    start = datetime.strptime(date_start, "%Y-%m-%d")
-    end = datetime.strptime(date_end, "%Y-%m-%d")
+    start = date.fromisoformat(date_start)
+    end = date.fromisoformat(date_end)
     period_length = (end - start).days + 1
     
     # Previous period ends the day before current period starts
     compare_end = start - timedelta(days=1)
     compare_start = compare_end - timedelta(days=period_length - 1)
     
-    return compare_start.strftime("%Y-%m-%d"), compare_end.strftime("%Y-%m-%d")
+    return compare_start.isoformat(), compare_end.isoformat()
+
+
+def _net_profit_periods(state: AgentState) -> tuple[str, str, str, str]:
+    """Periods A and B for the net profit loss pipeline (B derived if not provided)."""
+    date_start = state["date_start"]
+    date_end = state["date_end"]
+    
+    if state.get("compare_date_start") and state.get("compare_date_end"):
+        return date_start, date_end, state["compare_date_start"], state["compare_date_end"]
+    return (date_start, date_end, *_derive_comparison_period(date_start, date_end))
+
+
+def _comparison_periods(state: AgentState) -> tuple[str, str, str, str]:
+    """
+    Current and comparison periods for the comparison pipeline.
+    
+    Logic:
+    - If explicit compare dates provided: use them
+    - If single date range (multi-day) with no compare dates: compare first day vs last day
+      This handles "How did X change from Oct 15 to Oct 30" → Oct 15 vs Oct 30
+    - Otherwise: derive previous same-length period
+    """
+    date_start = state["date_start"]
+    date_end = state["date_end"]
+    
+    if state.get("compare_date_start") and state.get("compare_date_end"):
+        # Explicit comparison periods provided
+        return date_start, date_end, state["compare_date_start"], state["compare_date_end"]
+    if date_start != date_end:
+        # Multi-day range with no compare dates: last day (more recent) is
+        # "current", first day (earlier) is "comparison"
+        return date_end, date_end, date_start, date_start
+    # Single day query - derive previous day for comparison
+    return (date_start, date_end, *_derive_comparison_period(date_start, date_end))
+
+
+def _shared_ads_periods(state: AgentState) -> set:
+    """Periods whose ads summary both the net profit and comparison pipelines fetch."""
+    net_profit = _net_profit_periods(state)
+    comparison = _comparison_periods(state)
+    return {net_profit[:2], net_profit[2:]} & {comparison[:2], comparison[2:]}
+
+
+async def _prefetch_ads_summaries(periods: set) -> None:
+    """
+    Warm the given ads executive summaries while the LLM classifies the intent.
+    
+    The pipelines then join these calls through metrics_api's request
+    coalescing instead of starting over. Failures are left for the pipeline's
+    own call to retry and report.
+    """
+    results = await asyncio.gather(
+        *(metrics_api.get_ads_executive_summary(start, end) for start, end in periods),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.debug("Ads summary prefetch failed: %s", result)
 
 
 async def _execute_net_profit_loss_pipeline(state: AgentState) -> dict:
     """
     Deterministic pipeline for net profit loss questions.
     
-    Calls:
+    Calls (concurrently):
     1. get_non_optimal_spends() for period A
     2. get_non_optimal_spends() for period B (derived if not provided)
     3. get_ads_executive_summary() for period A (Ad TOS IS)
     4. get_ads_executive_summary() for period B (Ad TOS IS)
     """
-    date_start = state["date_start"]
-    date_end = state["date_end"]
+    date_start, date_end, compare_start, compare_end = _net_profit_periods(state)
     
-    # Derive comparison period if not provided
-    if state.get("compare_date_start") and state.get("compare_date_end"):
-        compare_start = state["compare_date_start"]
-        compare_end = state["compare_date_end"]
-    else:
-        compare_start, compare_end = _derive_comparison_period(date_start, date_end)
-    
-    logger.info(f"Net profit loss pipeline: A=[{date_start} to {date_end}], B=[{compare_start} to {compare_end}]")
-    
-    # Call APIs for period A
-    non_optimal_a = await metrics_api.get_non_optimal_spends(date_start, date_end)
-    ads_a = await metrics_api.get_ads_executive_summary(date_start, date_end)
+    logger.info("Net profit loss pipeline: A=[%s to %s], B=[%s to %s]", date_start, date_end, compare_start, compare_end)
     
-    # Call APIs for period B
-    non_optimal_b = await metrics_api.get_non_optimal_spends(compare_start, compare_end)
-    ads_b = await metrics_api.get_ads_executive_summary(compare_start, compare_end)
+    # The four calls are independent: run them concurrently so the pipeline
+    # waits for the slowest call (non-optimal spends, ~30s) instead of the sum
+    non_optimal_a, ads_a, non_optimal_b, ads_b = await asyncio.gather(
+        metrics_api.get_non_optimal_spends(date_start, date_end),
+        metrics_api.get_ads_executive_summary(date_start, date_end),
+        metrics_api.get_non_optimal_spends(compare_start, compare_end),
+        metrics_api.get_ads_executive_summary(compare_start, compare_end)
+    )
     
     # Extract Ad TOS IS (Top of Search Impression Share) from ads data
     tos_is_a = ads_a.get("tos_is", ads_a.get("TOS_IS", ads_a.get("top_of_search_is", 0)))
@@ -100,45 +215,18 @@ async def _execute_comparison_pipeline(state: AgentState) -> dict:
     """
     Deterministic pipeline for general comparison questions.
     
-    Calls ads executive summary for both periods.
-    
-    Logic:
-    - If explicit compare dates provided: use them
-    - If single date range (multi-day) with no compare dates: compare first day vs last day
-      This handles "How did X change from Oct 15 to Oct 30" → Oct 15 vs Oct 30
-    - Otherwise: derive previous same-length period
+    Calls ads executive summary for both periods (concurrently); see
+    _comparison_periods for how the periods are chosen.
     """
-    date_start = state["date_start"]
-    date_end = state["date_end"]
+    current_start, current_end, compare_start, compare_end = _comparison_periods(state)
     
-    if state.get("compare_date_start") and state.get("compare_date_end"):
-        # Explicit comparison periods provided
-        compare_start = state["compare_date_start"]
-        compare_end = state["compare_date_end"]
-        current_start = date_start
-        current_end = date_end
-    elif date_start != date_end:
-        # Multi-day range with no compare dates:
-        # Compare first day vs last day of the range
-        # This handles "How did X change from Oct 15 to Oct 30"
-        current_start = date_end  # Last day (more recent) = "current"
-        current_end = date_end
-        compare_start = date_start  # First day (earlier) = "comparison"
-        compare_end = date_start
-        logger.info(f"Comparing first vs last day of range: {compare_start} vs {current_start}")
-    else:
-        # Single day query - derive previous day for comparison
-        compare_start, compare_end = _derive_comparison_period(date_start, date_end)
-        current_start = date_start
-        current_end = date_end
+    logger.info("Comparison pipeline: Current=[%s to %s], Compare=[%s to %s]", current_start, current_end, compare_start, compare_end)
     
-    logger.info(f"Comparison pipeline: Current=[{current_start} to {current_end}], Compare=[{compare_start} to {compare_end}]")
-    
-    # Fetch current period (more recent)
-    current = await metrics_api.get_ads_executive_summary(current_start, current_end)
-    
-    # Fetch comparison period (earlier)
-    comparison = await metrics_api.get_ads_executive_summary(compare_start, compare_end)
+    # Fetch current period (more recent) and comparison period (earlier) in parallel
+    current, comparison = await asyncio.gather(
+        metrics_api.get_ads_executive_summary(current_start, current_end),
+        metrics_api.get_ads_executive_summary(compare_start, compare_end)
+    )
     
     return {
         "period_a_start": current_start,
@@ -150,30 +238,6 @@ async def _execute_comparison_pipeline(state: AgentState) -> dict:
     }
 
 
-def _format_date_range(start_str: str, end_str: str) -> str:
-    """
-    Format date range like metrics_query_handler: (Sep 1-14, 2025)
-    - Same month: "Sep 1-14, 2025"
-    - Different months: "Sep 1 - Oct 14, 2025"
-    - Single day: "Sep 1, 2025"
-    """
-    start = datetime.strptime(start_str, "%Y-%m-%d")
-    end = datetime.strptime(end_str, "%Y-%m-%d")
-    
-    if start == end:
-        # Single day: "Sep 1, 2025"
-        return start.strftime("%b %-d, %Y")
-    elif start.month == end.month and start.year == end.year:
-        # Same month: "Sep 1-14, 2025"
-        return f"{start.strftime('%b')} {start.day}-{end.day}, {start.year}"
-    elif start.year == end.year:
-        # Different months, same year: "Sep 1 - Oct 14, 2025"
-        return f"{start.strftime('%b')} {start.day} - {end.strftime('%b')} {end.day}, {start.year}"
-    else:
-        # Different years: "Dec 15, 2024 - Jan 14, 2025"
-        return f"{start.strftime('%b')} {start.day}, {start.year} - {end.strftime('%b')} {end.day}, {end.year}"
-
-
 def _format_net_profit_response(data: dict) -> str:
     """
     Deterministic formatting for net profit loss response.
@@ -184,8 +248,8 @@ def _format_net_profit_response(data: dict) -> str:
     tos_is_b = data["tos_is_b"]
     
     # Format date ranges for readability (Sep 1-14, 2025 format)
-    period_a = _format_date_range(data["period_a_start"], data["period_a_end"])
-    period_b = _format_date_range(data["period_b_start"], data["period_b_end"])
+    period_a = format_date_range(data["period_a_start"], data["period_a_end"])
+    period_b = format_date_range(data["period_b_start"], data["period_b_end"])
     
     return (
         f"Your net profit loss due to non-optimal spend over {period_a} "
@@ -195,31 +259,106 @@ def _format_net_profit_response(data: dict) -> str:
     )
 
 
-def _generate_comparison_explanation(data: dict, question: str) -> str:
-    """Generate LLM explanation for comparison data."""
-    settings = get_settings()
-    llm = ChatOpenAI(
-        model=settings.openai_model,
-        temperature=0.3,
-        api_key=settings.openai_api_key,
-        streaming=True
-    )
+def _format_metric_value(value: float, kind: str) -> str:
+    """Format a metric value per COMPARISON_EXPLANATION_PROMPT's rules (percent already scaled)."""
+    if kind == "currency":
+        return f"${value:,.2f}"
+    if kind == "percent":
+        return f"{value:.2f}%"
+    if kind == "ratio":
+        return f"{value:.2f}"
+    return f"{value:,.0f}"
+
+
+def _deterministic_comparison(data: dict, question: str) -> Optional[str]:
+    """
+    Build the comparison answer without the LLM when possible.
+    
+    Returns None (use the LLM) if the question asks for reasons, names zero or
+    several supported metrics, or the payloads lack numeric values for it.
+    """
+    if _ANALYSIS_RE.search(question):
+        return None
     
-    prompt = f"""{COMPARISON_EXPLANATION_PROMPT}
+    matched = [(key, kind) for pattern, key, kind in _COMPARISON_METRICS if pattern.search(question)]
+    if len(matched) != 1:
+        return None
+    key, kind = matched[0]
+    
+    recent = locate_metrics_payload(data["current"]).get(key)
+    earlier = locate_metrics_payload(data["comparison"]).get(key)
+    if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (recent, earlier)):
+        return None
+    
+    if kind == "percent":
+        recent, earlier = recent * 100, earlier * 100
+    
+    delta = recent - earlier
+    if delta == 0:
+        change = "No change"
+    else:
+        sign = "+" if delta > 0 else "-"
+        # A difference of two percentages is in points, not percent
+        magnitude = f"{abs(delta):.2f} pts" if kind == "percent" else _format_metric_value(abs(delta), kind)
+        change = f"{sign}{magnitude}"
+        if earlier:
+            direction = "increase" if delta > 0 else "decrease"
+            change += f" ({sign}{abs(delta / earlier) * 100:.1f}% {direction})"
+    
+    earlier_period = format_date_range(data["period_b_start"], data["period_b_end"])
+    recent_period = format_date_range(data["period_a_start"], data["period_a_end"])
+    return (
+        f"**{earlier_period}:** {_format_metric_value(earlier, kind)}\n"
+        f"**{recent_period}:** {_format_metric_value(recent, kind)}\n"
+        f"**Change:** {change}"
+    )
+
+
+def _to_prompt_json(payload: Any) -> str:
+    """Serialize API data for the prompt as compact, key-sorted JSON (not a dict repr)."""
+    return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str).decode()
 
-**Data:**
+
+async def _generate_comparison_explanation(data: dict, question: str) -> str:
+    """
+    Generate LLM explanation for comparison data.
+    
+    Awaits the streaming model so tokens reach astream_events (and the SSE
+    client) as they are generated instead of after the full completion.
+    """
+    scope = scope_key(
+        data["period_a_start"], data["period_a_end"], data["current"],
+        data["period_b_start"], data["period_b_end"], data["comparison"]
+    )
+    embedding = await _EXPLANATION_CACHE.aembed(question)
+    cached = _EXPLANATION_CACHE.lookup(embedding, scope)
+    if cached is not None:
+        return cached
+    
+    llm = get_chat_llm(get_settings().openai_model, 0.3)
+    
+    # Static instructions go in the system message so they form a stable,
+    # cacheable prompt prefix; only the data/question below change per call
+    dynamic_block = f"""**Data:**
 Current period ({data['period_a_start']} to {data['period_a_end']}):
-{data['current']}
+{_to_prompt_json(data['current'])}
 
 Comparison period ({data['period_b_start']} to {data['period_b_end']}):
-{data['comparison']}
+{_to_prompt_json(data['comparison'])}
 
 **User Question:** {question}
 
 **Response:**"""
     
-    response = llm.invoke(prompt)
-    return response.content.strip()
+    response = await llm.ainvoke([
+        SystemMessage(content=COMPARISON_EXPLANATION_PROMPT),
+        HumanMessage(content=dynamic_block)
+    ])
+    cached_tokens = (response.usage_metadata or {}).get("input_token_details", {}).get("cache_read", 0)
+    logger.debug("Comparison explanation prompt cache read tokens: %s", cached_tokens)
+    explanation = response.content.strip()
+    _EXPLANATION_CACHE.store(embedding, explanation, scope)
+    return explanation
 
 
 async def insight_query_handler_node(state: AgentState) -> AgentState:
@@ -235,12 +374,27 @@ async def insight_query_handler_node(state: AgentState) -> AgentState:
     set_jwt_token_for_task(state["_jwt_token"])
     
     question = state["question"]
-    logger.info(f"Processing insight_query: '{question}'")
+    logger.info("Processing insight_query: '%s'", question)
     
     # 1. Sub-classify insight_intent
-    insight_intent = _classify_insight_intent(question)
+    insight_intent = _match_insight_intent(question)
+    if insight_intent is not None:
+        logger.info("Insight intent fast path: %s", insight_intent)
+    else:
+        # The LLM round trip is slow: meanwhile fetch the ads summaries that
+        # either data pipeline would need (at most two; trend analysis uses none)
+        periods = _shared_ads_periods(state)
+        prefetch = asyncio.create_task(_prefetch_ads_summaries(periods)) if periods else None
+        try:
+            insight_intent = await _classify_insight_intent(question)
+        finally:
+            if prefetch is not None:
+                # Only stops waiting here: the backend calls are shielded and
+                # finish in the coalescing cache, where the pipelines join them
+                prefetch.cancel()
+                await asyncio.gather(prefetch, return_exceptions=True)
     state["insight_intent"] = insight_intent
-    logger.info(f"Insight intent: {insight_intent}")
+    logger.info("Insight intent: %s", insight_intent)
     
     # 2. Execute deterministic pipeline based on intent
     if insight_intent == "net_profit_loss":
@@ -253,7 +407,13 @@ async def insight_query_handler_node(state: AgentState) -> AgentState:
         response = result["response"]
     else:  # comparison
         data = await _execute_comparison_pipeline(state)
-        response = _generate_comparison_explanation(data, question)
+        response = _deterministic_comparison(data, question)
+        if response is not None:
+            logger.info("Comparison answered without LLM")
+            # No model tokens on this path: hand the text to the SSE stream directly
+            await adispatch_custom_event("response_token", {"token": response})
+        else:
+            response = await _generate_comparison_explanation(data, question)
     
     # 3. Set response
     state["response"] = response
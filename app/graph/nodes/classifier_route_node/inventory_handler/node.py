@@ -8,11 +8,12 @@ Handles questions about:
 """
 
 import logging
-from langchain_openai import ChatOpenAI
+from functools import lru_cache
 from langchain.agents import create_agent
 
 from app.models.agentState import AgentState
 from app.config import get_settings
+from app.utils.llm import get_chat_llm
 from app.context import set_jwt_token_for_task
 from .prompt import INVENTORY_HANDLER_SYSTEM_PROMPT
 from .inventory_tools import (
@@ -26,6 +27,24 @@ from .inventory_tools import (
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4)
+def _get_inventory_agent(model: str):
+    """Build (once per model) the inventory agent; its tools take all inputs as arguments."""
+    llm = get_chat_llm(model)
+    
+    return create_agent(
+        llm,
+        tools=[
+            get_current_doi,
+            get_doi_trend,
+            get_storage_fees_summary,
+            get_storage_fees_trend,
+            get_low_stock_asins
+        ],
+        system_prompt=INVENTORY_HANDLER_SYSTEM_PROMPT
+    )
+
+
 async def inventory_handler_node(state: AgentState) -> AgentState:
     """
     Handler for inventory_query type questions.
@@ -60,26 +79,7 @@ async def inventory_handler_node(state: AgentState) -> AgentState:
     
     settings = get_settings()
     
-    # Create LLM
-    llm = ChatOpenAI(
-        model=settings.openai_model,
-        temperature=0,
-        api_key=settings.openai_api_key,
-        streaming=True
-    )
-    
-    # Create agent with inventory tools
-    agent = create_agent(
-        llm,
-        tools=[
-            get_current_doi,
-            get_doi_trend,
-            get_storage_fees_summary,
-            get_storage_fees_trend,
-            get_low_stock_asins
-        ],
-        system_prompt=INVENTORY_HANDLER_SYSTEM_PROMPT
-    )
+    agent = _get_inventory_agent(settings.openai_model)
     
     logger.info("Running inventory query agent...")
     
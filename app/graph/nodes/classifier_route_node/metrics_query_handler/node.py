@@ -1,20 +1,99 @@
-from langchain_openai import ChatOpenAI
 from langchain.agents import create_agent
+from langchain_core.callbacks import adispatch_custom_event
 from langchain_core.tools import tool
 from typing import List
+from functools import lru_cache
+from contextvars import ContextVar
 import logging
+import re
 
 from app.models.agentState import AgentState
 from app.config import get_settings
+from app.utils.llm import get_chat_llm
 from app.graph.nodes.classifier_route_node.metrics_query_handler.prompt import METRICS_QUERY_SYSTEM_PROMPT
 from app.graph.nodes.classifier_route_node.metrics_query_handler.simple_metrics_tool import get_simple_metrics
+from app.graph.nodes.classifier_route_node.metrics_query_handler.simple_metrics_tool.tool import METRIC_TO_ENDPOINTS
 from app.metricsAccessLayer import metrics_api
 from app.context import set_jwt_token_for_task
+from app.utils.semantic_cache import SemanticCache, scope_key
 
 logger = logging.getLogger(__name__)
 
-# Store state for tool access
-_current_state = {}
+# Store state for tool access (per asyncio task, so concurrent requests don't race)
+_current_state: ContextVar[dict] = ContextVar("metrics_query_state")
+
+# Paraphrased questions ("what's my acos" / "show me acos") over the same dates
+# and account reuse a recent answer. The scope also pins every metric word,
+# number and intent word in the question, so "acos" can never be answered from
+# a "roas" entry and "why is my acos so high" never from "what's my acos".
+_RESPONSE_CACHE = SemanticCache("metrics_query_response", threshold=0.95, ttl_seconds=300)
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_METRIC_WORDS = frozenset(
+    word for metric in METRIC_TO_ENDPOINTS for word in metric.split("_")
+) - {"in", "is", "to", "of"}
+_INTENT_WORDS = frozenset({
+    "why", "how", "explain", "reason", "reasons", "cause", "caused",
+    "high", "higher", "low", "lower", "good", "bad", "better", "worse",
+    "up", "down", "increase", "increased", "decrease", "decreased",
+    "drop", "dropped", "improve", "fix", "should", "compare", "vs", "versus"
+})
+
+
+def _response_scope(state: AgentState) -> str:
+    """Exact-match part of the cache key: account, dates, metric/intent words, numbers."""
+    words = sorted({
+        word for word in _WORD_RE.findall(state["question"].lower())
+        if word in _METRIC_WORDS or word in _INTENT_WORDS or word.isdigit()
+    })
+    return scope_key(state["_jwt_token"], state["date_start"], state["date_end"], *words)
+
+
+@tool
+async def get_ads_metrics() -> dict:
+    """Fetch advertising metrics from Nyle backend.
+    
+    Returns advertising performance data including ACOS, ad spend, sales, etc.
+    """
+    logger.info("Tool: get_ads_metrics")
+    
+    st = _current_state.get()
+    result = await metrics_api.get_ads_executive_summary(
+        st["date_start"],
+        st["date_end"]
+    )
+    
+    logger.info("Retrieved ads metrics")
+    return result
+
+
+@tool
+async def get_financial_metrics() -> dict:
+    """Fetch financial metrics from Nyle backend.
+    
+    Returns financial data including profit, revenue, expenses, etc.
+    """
+    logger.info("Tool: get_financial_metrics")
+    
+    st = _current_state.get()
+    result = await metrics_api.get_financial_summary(
+        st["date_start"],
+        st["date_end"]
+    )
+    
+    logger.info("Retrieved financial metrics")
+    return result
+
+
+@lru_cache(maxsize=4)
+def _get_metrics_agent(model: str):
+    """Build (once per model) the metrics query agent; it holds no per-request state."""
+    llm = get_chat_llm(model)
+    
+    return create_agent(
+        llm,
+        tools=[get_simple_metrics],
+        system_prompt=METRICS_QUERY_SYSTEM_PROMPT
+    )
 
 
 async def metrics_query_handler_node(state: AgentState) -> AgentState:
@@ -26,60 +105,25 @@ async def metrics_query_handler_node(state: AgentState) -> AgentState:
     - "Show me total sales"
     - "Give me store overview"
     """
-    global _current_state
-    _current_state = state
+    _current_state.set(state)
     
     # Ensure JWT token is available for async tasks
     set_jwt_token_for_task(state["_jwt_token"])
     
-    logger.info(f"Processing metrics_query: '{state['question']}'")
+    logger.info("Processing metrics_query: '%s'", state['question'])
     
-    settings = get_settings()
+    scope = _response_scope(state)
+    embedding = await _RESPONSE_CACHE.aembed(state["question"])
+    cached = _RESPONSE_CACHE.lookup(embedding, scope)
+    if cached is not None:
+        # No model tokens on this path: hand the text to the SSE stream directly
+        await adispatch_custom_event("response_token", {"token": cached})
+        state["response"] = cached
+        return state
     
-    @tool
-    async def get_ads_metrics() -> dict:
-        """Fetch advertising metrics from Nyle backend.
-        
-        Returns advertising performance data including ACOS, ad spend, sales, etc.
-        """
-        logger.info("Tool: get_ads_metrics")
-        
-        result = await metrics_api.get_ads_executive_summary(
-            _current_state["date_start"],
-            _current_state["date_end"]
-        )
-        
-        logger.info("Retrieved ads metrics")
-        return result
-    
-    @tool
-    async def get_financial_metrics() -> dict:
-        """Fetch financial metrics from Nyle backend.
-        
-        Returns financial data including profit, revenue, expenses, etc.
-        """
-        logger.info("Tool: get_financial_metrics")
-        
-        result = await metrics_api.get_financial_summary(
-            _current_state["date_start"],
-            _current_state["date_end"]
-        )
-        
-        logger.info("Retrieved financial metrics")
-        return result
-    
-    llm = ChatOpenAI(
-        model=settings.openai_model,
-        temperature=0,
-        api_key=settings.openai_api_key,
-        streaming=True
-    )
+    settings = get_settings()
     
-    agent = create_agent(
-        llm,
-        tools=[get_simple_metrics],
-        system_prompt=METRICS_QUERY_SYSTEM_PROMPT
-    )
+    agent = _get_metrics_agent(settings.openai_model)
     
     logger.info("Running metrics query agent...")
     
@@ -92,6 +136,7 @@ async def metrics_query_handler_node(state: AgentState) -> AgentState:
     )
     
     state["response"] = result["messages"][-1].content
+    _RESPONSE_CACHE.store(embedding, state["response"], scope)
     logger.info("Generated response")
     
     return state
@@ -1,5 +1,5 @@
 """
-Simple Metrics Tool - AI agent for intelligent metric retrieval.
+Simple Metrics Tool - Deterministic metric retrieval from Nyle backend APIs.
 """
 
 from .tool import get_simple_metrics
@@ -4,23 +4,32 @@ Simple Metrics Tool - Deterministic metric retrieval from Nyle backend APIs.
 This tool:
 1. Receives a list of metric names
 2. Maps metrics to their corresponding API endpoints
-3. Calls only the required endpoints (in parallel)
+3. Calls only the required endpoints (in parallel, or one batched request when enabled)
 4. Returns only the requested metrics in a structured format
 """
 
-import asyncio
 from datetime import date, timedelta
+from functools import lru_cache
+from types import MappingProxyType
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Set, FrozenSet, Mapping, Tuple
 import logging
-import json
+
+import orjson
 
 from app.metricsAccessLayer import metrics_api
+from app.utils.metrics_payload import locate_metrics_payload
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=2)
+def _today_yesterday_strs(anchor: date) -> Tuple[str, str]:
+    """ISO strings for anchor and the day before, cached per calendar day."""
+    return anchor.isoformat(), (anchor - timedelta(days=1)).isoformat()
+
+
 def is_forecasted_query(date_start: str, date_end: str) -> bool:
     """
     Check if query is for forecasted data.
@@ -28,11 +37,10 @@ def is_forecasted_query(date_start: str, date_end: str) -> bool:
     Forecasted = single day query for today or yesterday.
     Returns True if (date_start == date_end == today) or (date_start == date_end == yesterday)
     """
-    today = date.today()
-    yesterday = today - timedelta(days=1)
+    if date_start != date_end:
+        return False
     
-    today_str = today.isoformat()
-    yesterday_str = yesterday.isoformat()
+    today_str, yesterday_str = _today_yesterday_strs(date.today())
     
     is_today = (date_start == today_str and date_end == today_str)
     is_yesterday = (date_start == yesterday_str and date_end == yesterday_str)
@@ -41,87 +49,101 @@ def is_forecasted_query(date_start: str, date_end: str) -> bool:
 
 
 # Mapping of metrics to their source endpoints (can have multiple endpoints per metric)
-# Format: metric_name -> list of endpoints to try (in order of preference)
-METRIC_TO_ENDPOINTS = {
+# Format: metric_name -> tuple of endpoints to try (in order of preference).
+# Read-only view so the table cannot be mutated at runtime.
+METRIC_TO_ENDPOINTS = MappingProxyType({
     # Ads endpoint metrics (also available in cfo as fallback)
-    "ad_sales": ["ads", "cfo"],
-    "ad_spend": ["ads", "cfo"],
-    "ad_clicks": ["ads", "cfo"],
-    "ad_impressions": ["ads", "cfo"],
-    "ad_units_sold": ["ads", "cfo"],
-    "ad_orders": ["ads", "cfo"],
-    "acos": ["ads", "cfo"],
-    "roas": ["ads", "cfo"],
-    "cpc": ["ads", "cfo"],
-    "cpm": ["ads", "cfo"],
-    "cac": ["ads"],
-    "ad_ctr": ["ads", "cfo"],
-    "ad_cvr": ["ads", "cfo"],
-    "time_in_budget": ["ads", "cfo"],
-    "ad_tos_is": ["ads", "cfo"],
+    "ad_sales": ("ads", "cfo"),
+    "ad_spend": ("ads", "cfo"),
+    "ad_clicks": ("ads", "cfo"),
+    "ad_impressions": ("ads", "cfo"),
+    "ad_units_sold": ("ads", "cfo"),
+    "ad_orders": ("ads", "cfo"),
+    "acos": ("ads", "cfo"),
+    "roas": ("ads", "cfo"),
+    "cpc": ("ads", "cfo"),
+    "cpm": ("ads", "cfo"),
+    "cac": ("ads",),
+    "ad_ctr": ("ads", "cfo"),
+    "ad_cvr": ("ads", "cfo"),
+    "time_in_budget": ("ads", "cfo"),
+    "ad_tos_is": ("ads", "cfo"),
     
     # Total endpoint metrics
-    "total_sales": ["total"],
-    "total_spend": ["total"],
-    "total_impressions": ["total"],
-    "ctr": ["total"],
-    "total_clicks": ["total"],
-    "cvr": ["total"],
-    "total_orders": ["total"],
-    "total_units_sold": ["total"],
-    "total_ntb_orders": ["total"],
-    "tacos": ["total"],
-    "mer": ["total"],
-    "lost_sales": ["total", "cfo"],  # exists in both
+    "total_sales": ("total",),
+    "total_spend": ("total",),
+    "total_impressions": ("total",),
+    "ctr": ("total",),
+    "total_clicks": ("total",),
+    "cvr": ("total",),
+    "total_orders": ("total",),
+    "total_units_sold": ("total",),
+    "total_ntb_orders": ("total",),
+    "tacos": ("total",),
+    "mer": ("total",),
+    "lost_sales": ("total", "cfo"),  # exists in both
     
     # CFO endpoint metrics
-    "available_capital": ["cfo"],
-    "frozen_capital": ["cfo"],
-    "borrowed_capital": ["cfo"],
-    "cost_of_goods_sold": ["cfo"],
-    "gross_profit": ["cfo"],
-    "net_profit": ["cfo"],
-    "amazon_fees": ["cfo"],
-    "misc": ["cfo"],
-    "net_margin": ["cfo"],
-    "opex": ["cfo"],
-    "ebitda": ["cfo"],
-    "roi": ["cfo"],  # moved from total to cfo only
-    "contribution_margin": ["cfo"],  # moved from total to cfo only
-    "contribution_profit": ["cfo"],  # moved from total to cfo only
-    "gross_margin": ["cfo"],  # moved from total to cfo only
+    "available_capital": ("cfo",),
+    "frozen_capital": ("cfo",),
+    "borrowed_capital": ("cfo",),
+    "cost_of_goods_sold": ("cfo",),
+    "gross_profit": ("cfo",),
+    "net_profit": ("cfo",),
+    "amazon_fees": ("cfo",),
+    "misc": ("cfo",),
+    "net_margin": ("cfo",),
+    "opex": ("cfo",),
+    "ebitda": ("cfo",),
+    "roi": ("cfo",),  # moved from total to cfo only
+    "contribution_margin": ("cfo",),  # moved from total to cfo only
+    "contribution_profit": ("cfo",),  # moved from total to cfo only
+    "gross_margin": ("cfo",),  # moved from total to cfo only
     
     # Organic endpoint metrics
-    "organic_impressions": ["organic"],
-    "organic_clicks": ["organic"],
-    "organic_orders": ["organic"],
-    "organic_units_sold": ["organic"],
-    "organic_cvr": ["organic"],
-    "organic_ctr": ["organic"],
-    "organic_sales": ["organic"],
-    "organic_lost_sales": ["organic"],
-    "organic_add_to_cart": ["organic"],
+    "organic_impressions": ("organic",),
+    "organic_clicks": ("organic",),
+    "organic_orders": ("organic",),
+    "organic_units_sold": ("organic",),
+    "organic_cvr": ("organic",),
+    "organic_ctr": ("organic",),
+    "organic_sales": ("organic",),
+    "organic_lost_sales": ("organic",),
+    "organic_add_to_cart": ("organic",),
     
     # Attribution endpoint metrics
-    "attribution_sales": ["attribution"],
-    "attribution_spend": ["attribution"],
-    "attribution_impressions": ["attribution"],
-    "attribution_clicks": ["attribution"],
-    "attribution_units_sold": ["attribution"],
-    "attribution_orders": ["attribution"],
-    "attribution_ctr": ["attribution"],
-    "attribution_cvr": ["attribution"],
-    "attribution_acos": ["attribution"],
-    "attribution_roas": ["attribution"],
-    "attribution_cpc": ["attribution"],
-    "attribution_cpm": ["attribution"],
-    "attribution_add_to_cart": ["attribution"],
+    "attribution_sales": ("attribution",),
+    "attribution_spend": ("attribution",),
+    "attribution_impressions": ("attribution",),
+    "attribution_clicks": ("attribution",),
+    "attribution_units_sold": ("attribution",),
+    "attribution_orders": ("attribution",),
+    "attribution_ctr": ("attribution",),
+    "attribution_cvr": ("attribution",),
+    "attribution_acos": ("attribution",),
+    "attribution_roas": ("attribution",),
+    "attribution_cpc": ("attribution",),
+    "attribution_cpm": ("attribution",),
+    "attribution_add_to_cart": ("attribution",),
     
     # Inventory endpoint metrics
-    "safety_stock": ["inventory"],
-    "inventory_turnover": ["inventory"],
-    "fba_in_stock_rate": ["inventory"],
-}
+    "safety_stock": ("inventory",),
+    "inventory_turnover": ("inventory",),
+    "fba_in_stock_rate": ("inventory",),
+})
+
+
+
+def _build_endpoint_index() -> Mapping[str, FrozenSet[str]]:
+    """Reverse METRIC_TO_ENDPOINTS: endpoint -> every metric it can serve."""
+    index: Dict[str, Set[str]] = {}
+    for metric, endpoints in METRIC_TO_ENDPOINTS.items():
+        for endpoint in endpoints:
+            index.setdefault(endpoint, set()).add(metric)
+    return MappingProxyType({endpoint: frozenset(metrics) for endpoint, metrics in index.items()})
+
+
+ENDPOINT_TO_METRICS = _build_endpoint_index()
 
 
 def normalize_metric_name(name: str) -> str:
@@ -132,57 +154,52 @@ def normalize_metric_name(name: str) -> str:
 def truncate_decimals(value: Any) -> Any:
     """
     Truncate decimal numbers to integers (cut decimals, don't round).
-    Handles floats, ints, dicts, and lists recursively.
+    Handles floats, ints, dicts, and lists.
+    
+    Nested dicts/lists are walked with an explicit stack and updated in place
+    (no recursion, no copies), so only pass data the caller owns.
     """
     if isinstance(value, float):
         return int(value)
-    elif isinstance(value, dict):
-        return {k: truncate_decimals(v) for k, v in value.items()}
-    elif isinstance(value, list):
-        return [truncate_decimals(v) for v in value]
+    if not isinstance(value, (dict, list)):
+        return value
+    
+    stack = [value]
+    while stack:
+        container = stack.pop()
+        items = container.items() if isinstance(container, dict) else enumerate(container)
+        for key, item in items:
+            # Float leaves are the common case (flat metrics payloads)
+            if isinstance(item, float):
+                container[key] = int(item)
+            elif isinstance(item, (dict, list)):
+                stack.append(item)
     return value
 
 
 def build_lowercase_key_map(response_data) -> Dict[str, Any]:
     """
     Build a lowercase key -> value mapping from API response.
-    Handles multiple response formats:
-    - {"data": [{"value": {...metrics...}}]} (timespan=day format)
-    - [{"metric": value}] (plain list)
-    - {"data": {...metrics...}} (nested dict)
-    - {"metric": value} (flat dict)
+    See locate_metrics_payload for the supported response formats.
     """
-    # Handle list response directly
-    if isinstance(response_data, list):
-        if len(response_data) > 0 and isinstance(response_data[0], dict):
-            first_item = response_data[0]
-            # Check if metrics are in 'value' key
-            if 'value' in first_item and isinstance(first_item['value'], dict):
-                return {normalize_metric_name(k): v for k, v in first_item['value'].items()}
-            return {normalize_metric_name(k): v for k, v in first_item.items()}
+    payload = locate_metrics_payload(response_data)
+    return {normalize_metric_name(k): v for k, v in payload.items()}
+
+
+def extract_requested(response_data, wanted: FrozenSet[str]) -> Dict[str, Any]:
+    """
+    Like build_lowercase_key_map, but keep only the normalized keys in `wanted`.
+    Avoids materializing every metric when only a few were requested.
+    """
+    if not wanted:
         return {}
     
-    # Handle dict response
-    if isinstance(response_data, dict):
-        # Check if 'data' is a list (timespan=day format: {"data": [{"value": {...}}]})
-        if 'data' in response_data and isinstance(response_data['data'], list):
-            data_list = response_data['data']
-            if len(data_list) > 0 and isinstance(data_list[0], dict):
-                first_item = data_list[0]
-                # Check if metrics are in 'value' key
-                if 'value' in first_item and isinstance(first_item['value'], dict):
-                    return {normalize_metric_name(k): v for k, v in first_item['value'].items()}
-                return {normalize_metric_name(k): v for k, v in first_item.items()}
-            return {}
-        
-        # Check if 'data' is a dict
-        if 'data' in response_data and isinstance(response_data['data'], dict):
-            return {normalize_metric_name(k): v for k, v in response_data['data'].items()}
-        
-        # Metrics at top level
-        return {normalize_metric_name(k): v for k, v in response_data.items()}
-    
-    return {}
+    out = {}
+    for k, v in locate_metrics_payload(response_data).items():
+        normalized = normalize_metric_name(k)
+        if normalized in wanted:
+            out[normalized] = v
+    return out
 
 
 class MetricsInput(BaseModel):
@@ -215,69 +232,66 @@ async def get_simple_metrics(metric_list: List[str], date_start: str, date_end:
     Returns:
         JSON string containing only the requested metrics with their values
     """
-    logger.info(f"Simple Metrics Tool called with metrics: {metric_list}, dates: {date_start} to {date_end}")
-    
     # Check if this is a forecasted query (today or yesterday single day)
     is_forecasted = is_forecasted_query(date_start, date_end)
     timespan = "day" if is_forecasted else None
-    logger.info(f"Is forecasted query: {is_forecasted}, timespan: {timespan}")
+    
+    # Collected as we go and emitted as a single record when the call finishes
+    log_ctx: Dict[str, Any] = {
+        "metric_list": metric_list,
+        "date_start": date_start,
+        "date_end": date_end,
+        "is_forecasted": is_forecasted,
+        "timespan": timespan,
+    }
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
     
     try:
         # Step 1: Determine ALL endpoints needed (including fallbacks)
         endpoints_needed: Set[str] = set()
+        requested_normalized: Set[str] = set()
         for metric in metric_list:
             metric_normalized = normalize_metric_name(metric)
+            requested_normalized.add(metric_normalized)
             if metric_normalized in METRIC_TO_ENDPOINTS:
                 # Add all possible endpoints for this metric
                 endpoints_needed.update(METRIC_TO_ENDPOINTS[metric_normalized])
-            else:
-                logger.warning(f"Unknown metric: {metric}")
-        
-        logger.info(f"Endpoints needed: {endpoints_needed}")
-        
-        # Step 2: Call all required endpoints in parallel
-        api_tasks = {}
         
-        if "ads" in endpoints_needed:
-            api_tasks["ads"] = metrics_api.get_ads_executive_summary(date_start, date_end, timespan=timespan)
-        if "total" in endpoints_needed:
-            api_tasks["total"] = metrics_api.get_total_metrics_summary(date_start, date_end, timespan=timespan)
-        if "cfo" in endpoints_needed:
-            api_tasks["cfo"] = metrics_api.get_financial_summary(date_start, date_end, timespan=timespan)
-        if "organic" in endpoints_needed:
-            api_tasks["organic"] = metrics_api.get_organic_metrics(date_start, date_end, timespan=timespan)
-        if "attribution" in endpoints_needed:
-            api_tasks["attribution"] = metrics_api.get_attribution_metrics(date_start, date_end, timespan=timespan)
-        if "inventory" in endpoints_needed:
-            api_tasks["inventory"] = metrics_api.get_inventory_status(date_start, date_end, timespan=timespan)
+        log_ctx["unknown_metrics"] = sorted(requested_normalized - METRIC_TO_ENDPOINTS.keys())
+        log_ctx["endpoints"] = sorted(endpoints_needed)
         
-        # Execute all API calls in parallel
+        # Step 2: Fetch all required endpoints together (see metrics_api.get_batched)
         api_responses: Dict[str, dict] = {}
         api_responses_normalized: Dict[str, Dict[str, Any]] = {}  # lowercase key maps
         
-        if api_tasks:
-            task_keys = list(api_tasks.keys())
-            task_values = list(api_tasks.values())
-            results = await asyncio.gather(*task_values, return_exceptions=True)
+        if endpoints_needed:
+            results = await metrics_api.get_batched(
+                list(endpoints_needed), date_start, date_end, timespan=timespan
+            )
             
-            for key, result in zip(task_keys, results):
+            failed_endpoints = []
+            for key, result in results.items():
                 if isinstance(result, Exception):
-                    logger.error(f"Error calling {key} endpoint: {result}")
+                    logger.error("Error calling %s endpoint: %s", key, result)
+                    failed_endpoints.append(key)
                     api_responses[key] = {}
                     api_responses_normalized[key] = {}
                 else:
-                    # Build normalized map and log
-                    normalized = build_lowercase_key_map(result)
-                    normalized_keys = list(normalized.keys())[:10]
-                    logger.info(f"Retrieved {key} data - extracted {len(normalized)} metrics: {normalized_keys}")
+                    # Normalize only the requested metrics this endpoint can serve
+                    wanted = ENDPOINT_TO_METRICS.get(key, frozenset()) & requested_normalized
+                    normalized = extract_requested(result, wanted)
+                    if debug_enabled:
+                        logger.debug("Retrieved %s data - extracted %d metrics: %s", key, len(normalized), list(normalized))
                     api_responses[key] = result
                     api_responses_normalized[key] = normalized
+            log_ctx["failed_endpoints"] = failed_endpoints
         
         # Step 3: Extract requested metrics (try all endpoints for each metric)
         result_metrics = {}
+        missing_metrics = []
         for metric in metric_list:
             metric_normalized = normalize_metric_name(metric)
-            endpoints_to_try = METRIC_TO_ENDPOINTS.get(metric_normalized, [])
+            endpoints_to_try = METRIC_TO_ENDPOINTS.get(metric_normalized, ())
             
             found = False
             for endpoint in endpoints_to_try:
@@ -285,17 +299,13 @@ async def get_simple_metrics(metric_list: List[str], date_start: str, date_end:
                     normalized_response = api_responses_normalized[endpoint]
                     if metric_normalized in normalized_response:
                         result_metrics[metric] = normalized_response[metric_normalized]
-                        logger.info(f"Found {metric} in {endpoint} endpoint")
+                        if debug_enabled:
+                            logger.debug("Found %s in %s endpoint", metric, endpoint)
                         found = True
                         break
             
             if not found:
-                # Log available keys from all tried endpoints
-                all_available_keys = []
-                for endpoint in endpoints_to_try:
-                    if endpoint in api_responses_normalized:
-                        all_available_keys.extend(list(api_responses_normalized[endpoint].keys()))
-                logger.warning(f"Metric {metric} not found. Tried endpoints: {endpoints_to_try}. Available keys: {all_available_keys}")
+                missing_metrics.append(metric)
         
         # Step 4: Truncate decimals and return structured JSON
         result_metrics = truncate_decimals(result_metrics)
@@ -306,15 +316,25 @@ async def get_simple_metrics(metric_list: List[str], date_start: str, date_end:
             "is_forecasted": is_forecasted
         }
         
-        logger.info(f"Returning metrics: {result_metrics}, is_forecasted: {is_forecasted}")
-        return json.dumps(output)
+        log_ctx["found_metrics"] = list(result_metrics)
+        log_ctx["missing_metrics"] = missing_metrics
+        logger.info(
+            "simple_metrics_completed metrics=%s dates=%s..%s endpoints=%s found=%d missing=%s forecasted=%s",
+            metric_list, date_start, date_end, log_ctx["endpoints"], len(result_metrics),
+            missing_metrics, is_forecasted,
+            extra=log_ctx
+        )
+        # The full payload is only worth rendering when debugging
+        if debug_enabled:
+            logger.debug("Returning metrics: %s, is_forecasted: %s", result_metrics, is_forecasted)
+        return orjson.dumps(output).decode()
     
     except Exception as e:
-        logger.error(f"Error in simple metrics tool: {str(e)}", exc_info=True)
+        logger.error("simple_metrics_failed metrics=%s: %s", metric_list, e, exc_info=True, extra=log_ctx)
         output = {
             "status": "error",
             "metrics": {},
             "message": f"Error retrieving metrics: {str(e)}",
             "is_forecasted": False
         }
-        return json.dumps(output)
+        return orjson.dumps(output).decode()
@@ -0,0 +1,122 @@
+"""
+Label Cache - Persistent exact-match cache for validated label extractions.
+
+Backs the node's in-process LRU with a SQLite file so entries survive worker
+restarts and are shared by every worker on the same host. Keys are a blake2b
+digest of the (ASIN-masked question, PST date) pair the node already uses.
+
+Disabled unless `label_cache_path` is set; when disabled (or when SQLite
+fails) `get()` returns None and `set()` is a no-op.
+
+Usage:
+    from app.graph.nodes.label_normalizer.cache import LabelCache
+    
+    _CACHE = LabelCache()
+    
+    cached_json = _CACHE.get(key)
+    if cached_json is None:
+        cached_json = extract(question).model_dump_json()
+        _CACHE.set(key, cached_json)
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS label_cache (
+    key BLOB PRIMARY KEY,
+    extraction_json TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+def _digest(key: Tuple[str, ...]) -> bytes:
+    """Short, fixed-size primary key for a cache key tuple."""
+    return hashlib.blake2b("\x1f".join(key).encode(), digest_size=16).digest()
+
+
+class LabelCache:
+    """
+    SQLite-backed, TTL'd cache of extraction JSON.
+    
+    One connection per process, opened lazily on first use; expired rows are
+    purged when it is opened.
+    """
+    
+    def __init__(self, ttl_seconds: int = 2 * 24 * 3600):
+        self.ttl_seconds = ttl_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        path = get_settings().label_cache_path
+        if not path:
+            return None
+        if self._conn is None:
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA mmap_size=67108864")
+            conn.execute(_SCHEMA)
+            conn.execute(
+                "DELETE FROM label_cache WHERE created_at <= ?",
+                (int(time.time()) - self.ttl_seconds,)
+            )
+            self._conn = conn
+        return self._conn
+    
+    def warm(self) -> None:
+        """Open the connection (and purge expired rows) ahead of first use."""
+        try:
+            with self._lock:
+                self._connect()
+        except sqlite3.Error as e:
+            logger.warning("Label cache warmup failed: %s", e)
+    
+    def get(self, key: Tuple[str, ...]) -> Optional[str]:
+        """Return the cached extraction JSON for key, if present and fresh."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                if conn is None:
+                    return None
+                digest = _digest(key)
+                row = conn.execute(
+                    "SELECT extraction_json FROM label_cache WHERE key = ? AND created_at > ?",
+                    (digest, int(time.time()) - self.ttl_seconds)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                conn.execute("UPDATE label_cache SET hits = hits + 1 WHERE key = ?", (digest,))
+                self.hits += 1
+                return row[0]
+        except sqlite3.Error as e:
+            logger.warning("Label cache lookup failed: %s", e)
+            return None
+    
+    def set(self, key: Tuple[str, ...], extraction_json: str) -> None:
+        """Store extraction JSON under key, replacing any previous entry."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                if conn is None:
+                    return
+                conn.execute(
+                    "INSERT OR REPLACE INTO label_cache (key, extraction_json, created_at, hits) VALUES (?, ?, ?, 0)",
+                    (_digest(key), extraction_json, int(time.time()))
+                )
+        except sqlite3.Error as e:
+            logger.warning("Label cache store failed: %s", e)
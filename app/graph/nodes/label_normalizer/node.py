@@ -1,16 +1,33 @@
-from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from typing import Dict, List, Optional, Literal, Tuple
+from functools import lru_cache
+import asyncio
+import contextvars
 import logging
 import re
+from collections import OrderedDict
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
 
 from app.models.agentState import AgentState
-from app.models.date_labels import DateLabelLiteral
+from app.models.date_labels import DateLabelLiteral, PAST_DAYS_LABELS
 from app.config import get_settings
+from app.utils.llm import get_chat_llm
+from app.graph.nodes.label_normalizer.cache import LabelCache
 from app.graph.nodes.label_normalizer.prompt import LABEL_NORMALIZER_PROMPT
+from app.utils.semantic_cache import SemanticCache, scope_key
 
 logger = logging.getLogger(__name__)
 
+# "Today" for date labels is the PST calendar day
+_PST_TZ = ZoneInfo("America/Los_Angeles")
+
+# Compiled once at import instead of on every ASIN check; case-insensitive so
+# only the matched code is uppercased, never the whole question
+_ASIN_VALIDATE_RE = re.compile(r'[A-Z0-9]{10}', re.IGNORECASE)
+# One scan for both shapes: group 1 is B-prefixed (most ASINs), group 2 any 10-char code
+_ASIN_RE = re.compile(r'\b(?:(B[A-Z0-9]{9})|([A-Z0-9]{10}))\b', re.IGNORECASE)
+
 
 class LabelExtraction(BaseModel):
     """
@@ -77,31 +94,397 @@ def validate_asin(asin: str) -> bool:
     """
     if not asin or len(asin) != 10:
         return False
-    return bool(re.match(r'^[A-Z0-9]{10}$', asin.upper()))
+    return _ASIN_VALIDATE_RE.fullmatch(asin) is not None
 
 
 def extract_asin_from_text(text: str) -> Optional[str]:
     """
     Extract ASIN from text using regex.
+    
+    B-prefixed codes win over an earlier generic 10-character code, so the
+    single scan keeps the first generic code only as a fallback.
+    """
+    fallback = None
+    for match in _ASIN_RE.finditer(text):
+        if match.group(1):
+            return match.group(1).upper()
+        if fallback is None:
+            fallback = match.group(2)
+    return fallback.upper() if fallback else None
+
+
+# ========== Deterministic fast path ==========
+# Common questions ("B0XXXXXXXX sales last week", "acos yesterday",
+# "sales 2025-03-01 to 2025-03-07", "december sales") carry at most one literal
+# ASIN and a single unambiguous date phrase, ISO range or bare month; those can
+# be labelled without the LLM.
+
+_SIMPLE_DATE_PHRASES = {
+    "today": "today",
+    "yesterday": "yesterday",
+    "this week": "this_week",
+    "last week": "last_week",
+    "this month": "this_month",
+    "month to date": "mtd",
+    "mtd": "mtd",
+    "last month": "last_month",
+    "this year": "this_year",
+    "last year": "last_year",
+    "year to date": "ytd",
+    "ytd": "ytd",
+}
+
+# One scanner over the lowercased question; m.lastgroup says what was hit.
+# Branch order matters: ASINs, date phrases and ISO dates are consumed before
+# the "ambiguous" branch can see their digits or words like "week"/"days".
+# Anything ambiguous (digits, abbreviated months, ordinals and day-position
+# words, comparison words, other period words) means a second period or an
+# explicit day, so we defer to the LLM. "may" is too common a word to be a
+# month here, so it stays ambiguous.
+_FAST_PATH_RE = re.compile(
+    r"(?P<asin>\bb0[a-z0-9]{8}\b)"
+    r"|\b(?P<phrase>" + "|".join(sorted(map(re.escape, _SIMPLE_DATE_PHRASES), key=len, reverse=True)) + r")\b"
+    r"|\b(?:last|past) (?P<days>\d{1,3}) days\b"
+    r"|\b(?P<iso_start>\d{4}-\d{2}-\d{2})(?: (?:to|through|-) (?P<iso_end>\d{4}-\d{2}-\d{2}))?\b"
+    r"|\b(?P<month>january|february|march|april|june|july|august|september|october|november|december)\b"
+    r"|(?P<ambiguous>\d|\b(?:compare|compared|vs|versus|against|than|between|from|since|"
+    r"jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec|week|weeks|month|months|"
+    r"year|years|day|days|quarter|q[1-4]|first|second|third|fourth|fifth|sixth|seventh|eighth|ninth|"
+    r"tenth|eleventh|twelfth|[a-z]+teenth|twentieth|thirtieth|twenty|thirty|end|start|beginning|mid|middle|"
+    r"early|late|until|till|before|after|ago|prior|previous)\b)"
+)
+
+
+@lru_cache(maxsize=4096)
+def _scan_fast_path(
+    question_lower: str
+) -> Optional[Tuple[str, Optional[int], Optional[str], Optional[str], Optional[str]]]:
+    """
+    Scan a normalized question for the fast path.
+    
+    Returns (label, custom_days_count, asin, explicit_start, explicit_end),
+    or None if the LLM is needed. Labels are relative ("last_week") and ISO
+    dates are absolute, so the result does not depend on the current day and
+    can be memoized for the process lifetime.
+    """
+    asins = set()
+    date_match = None
+    for match in _FAST_PATH_RE.finditer(question_lower):
+        kind = match.lastgroup
+        if kind == "ambiguous":
+            return None
+        if kind == "asin":
+            asins.add(match.group("asin").upper())
+        elif date_match is not None:
+            return None
+        else:
+            date_match = match
+    
+    if len(asins) > 1 or date_match is None:
+        return None
+    
+    custom_days = None
+    explicit_start = explicit_end = None
+    if date_match.lastgroup == "phrase":
+        label = _SIMPLE_DATE_PHRASES[date_match.group("phrase")]
+    elif date_match.lastgroup == "month":
+        label = date_match.group("month")
+    elif date_match.group("iso_start") is not None:
+        try:
+            start = date.fromisoformat(date_match.group("iso_start"))
+            end = date.fromisoformat(date_match.group("iso_end") or date_match.group("iso_start"))
+        except ValueError:
+            return None
+        if start > end:
+            return None
+        label = "explicit_date"
+        explicit_start, explicit_end = start.isoformat(), end.isoformat()
+    else:
+        days = int(date_match.group("days"))
+        if days <= 0:
+            return None
+        label = PAST_DAYS_LABELS.get(days, "past_days")
+        if label == "past_days":
+            custom_days = days
+    
+    return label, custom_days, (asins.pop() if asins else None), explicit_start, explicit_end
+
+
+def _try_fast_extraction(question: str, current_date: date) -> Optional[LabelExtraction]:
+    """
+    Label simple single-period questions without calling the LLM.
+    
+    Returns None whenever the question is not clearly at most one ASIN with a
+    single relative date phrase or ISO range, so the caller falls back to the
+    LLM. Future ISO dates also go to the LLM, which rolls them back a year.
+    """
+    scanned = _scan_fast_path(" ".join(question.lower().split()))
+    if scanned is None:
+        return None
+    
+    label, custom_days, asin, explicit_start, explicit_end = scanned
+    if explicit_end is not None and explicit_end > current_date.isoformat():
+        return None
+    
+    return LabelExtraction(
+        date_start_label=label,
+        date_end_label=label,
+        explicit_date_start=explicit_start,
+        explicit_date_end=explicit_end,
+        custom_days_count=custom_days,
+        asin=asin
+    )
+
+
+@lru_cache(maxsize=4)
+def _get_extraction_llm(model: str):
+    """Build (once per model) the ChatOpenAI client bound to LabelExtraction output."""
+    # Pin server-enforced JSON schema output (no prompt-coaxed JSON, no parse retries)
+    return get_chat_llm(model).with_structured_output(LabelExtraction, method="json_schema", strict=True)
+
+
+class LabelExtractionBatch(BaseModel):
+    """Structured output for a micro-batch: one extraction per numbered question."""
+    
+    extractions: List[LabelExtraction] = Field(
+        description="One extraction per numbered question, in the same order"
+    )
+
+
+@lru_cache(maxsize=4)
+def _get_batch_extraction_llm(model: str):
+    """Build (once per model) the ChatOpenAI client bound to LabelExtractionBatch output."""
+    return get_chat_llm(model).with_structured_output(LabelExtractionBatch, method="json_schema", strict=True)
+
+
+class _LabelExtractionBatcher:
+    """
+    Micro-batches concurrent first-attempt extractions into one LLM call.
+    
+    The first question to arrive opens a window; everything submitted before it
+    closes (same model and year) shares a single structured-output request.
+    Any batch failure or count mismatch falls back to one call per question.
+    """
+    
+    def __init__(self):
+        # (model, current_year) -> [(question, future)]
+        self._pending: Dict[Tuple[str, int], List[Tuple[str, asyncio.Future]]] = {}
+    
+    async def extract(self, question: str, model: str, current_year: int, window_seconds: float) -> LabelExtraction:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (model, current_year)
+        batch = self._pending.setdefault(key, [])
+        batch.append((question, future))
+        if len(batch) == 1:
+            # Flush in an empty context so the shared call is not traced under
+            # (or streamed into) whichever request happened to open the window
+            loop.call_later(window_seconds, self._start_flush, key, context=contextvars.Context())
+        return await future
+    
+    def _start_flush(self, key: Tuple[str, int]) -> None:
+        asyncio.ensure_future(self._flush(key, self._pending.pop(key, [])))
+    
+    async def _flush(self, key: Tuple[str, int], batch: List[Tuple[str, asyncio.Future]]) -> None:
+        model, current_year = key
+        try:
+            if len(batch) == 1:
+                results = [await _get_extraction_llm(model).ainvoke(
+                    _format_extraction_prompt(batch[0][0], current_year)
+                )]
+            else:
+                logger.info("📦 Batched label extraction for %s questions", len(batch))
+                numbered = "\n".join(f"{i}. {q}" for i, (q, _) in enumerate(batch, 1))
+                response = await _get_batch_extraction_llm(model).ainvoke(_format_extraction_prompt(
+                    numbered,
+                    current_year,
+                    feedback_reminder="12. **Batch:** the question above is a numbered list of independent "
+                                      "questions. Return one extraction per question, in the same order."
+                ))
+                results = response.extractions
+                if len(results) != len(batch):
+                    raise ValueError(f"expected {len(batch)} extractions, got {len(results)}")
+        except Exception as e:
+            if len(batch) == 1:
+                if not batch[0][1].done():
+                    batch[0][1].set_exception(e)
+                return
+            logger.warning("⚠️ Batched extraction failed (%s), extracting individually", e)
+            results = await asyncio.gather(
+                *(_get_extraction_llm(model).ainvoke(_format_extraction_prompt(q, current_year)) for q, _ in batch),
+                return_exceptions=True
+            )
+        
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+_label_batcher = _LabelExtractionBatcher()
+
+
+@lru_cache(maxsize=2)
+def _prompt_chunks(current_year: int) -> Tuple[str, ...]:
+    """
+    Split LABEL_NORMALIZER_PROMPT around its per-call fields, year filled in.
+    
+    The ~4KB template is parsed once per year instead of on every call; the
+    chunks sit between feedback_section, question and feedback_reminder.
+    """
+    marker = "\x00"
+    return tuple(LABEL_NORMALIZER_PROMPT.format(
+        current_year=current_year,
+        feedback_section=marker,
+        question=marker,
+        feedback_reminder=marker
+    ).split(marker))
+
+
+def _format_extraction_prompt(
+    question: str,
+    current_year: int,
+    feedback_section: str = "No previous feedback (first attempt).",
+    feedback_reminder: str = ""
+) -> str:
+    """Fill LABEL_NORMALIZER_PROMPT for one question (or a numbered batch)."""
+    head, after_feedback, after_question, tail = _prompt_chunks(current_year)
+    return f"{head}{feedback_section}{after_feedback}{question}{after_question}{feedback_reminder}{tail}"
+
+
+# One extra LLM attempt, and only when the deterministic checks below fail
+_MAX_EXTRACTION_ATTEMPTS = 2
+
+# Exact-match LRU of validated LLM extractions, keyed by (whitespace-normalized
+# question, PST date): the same question on the same day yields the same labels
+_EXTRACTION_CACHE_SIZE = 1024
+_extraction_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+# Second exact-match tier on disk (opt-in via label_cache_path): survives
+# restarts and is shared by every worker on the host
+_persistent_cache = LabelCache()
+
+# Semantic layer for paraphrases ("past 9 days performance" / "show me past 9
+# days sales"). ASINs are masked out of the embedded text and re-extracted by
+# regex; every date-bearing token must match exactly (via the cache scope), so
+# "past 8 days" or "october" vs "november" can never share an entry.
+_LABEL_CACHE = SemanticCache("label_extraction", threshold=0.92)
+# Only the B0 shape is trusted without the LLM: a looser "10 chars with a digit"
+# rule also swallows glued date phrases such as "last30days"
+_ASIN_MASK_RE = re.compile(r'\bB0[A-Z0-9]{8}\b', re.IGNORECASE)
+_DATE_TOKEN_RE = re.compile(
+    r"\d+|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\b"
+    r"|\b(?:today|yesterday|days?|weeks?|weekend|months?|years?|quarters?|ytd|mtd|last|this|past"
+    r"|previous|prior|since|from|to|through|until|ago|vs|versus|compar[a-z]*|first|second|third)\b",
+    re.IGNORECASE
+)
+
+
+def _adjust_future_date(date_str: str, current_date: date) -> str:
+    """If date is in the future, adjust to previous year."""
+    if not date_str:
+        return date_str
+    
+    try:
+        date_obj = date.fromisoformat(date_str)
+        
+        # If the date is in the future, use previous year
+        if date_obj > current_date:
+            adjusted_year = date_obj.year - 1
+            adjusted_date = date_obj.replace(year=adjusted_year)
+            adjusted_str = adjusted_date.isoformat()
+            logger.info("📅 Adjusted future date %s → %s", date_str, adjusted_str)
+            return adjusted_str
+        
+        return date_str
+    except Exception as e:
+        logger.warning("⚠️ Could not adjust date %s: %s", date_str, e)
+        return date_str
+
+
+def _iso_or_none(date_str: Optional[str]) -> Optional[date]:
+    """Parse an ISO date string, returning None if missing or malformed."""
+    try:
+        return date.fromisoformat(date_str) if date_str else None
+    except ValueError:
+        return None
+
+
+def _validate_extraction(extraction: LabelExtraction) -> Optional[str]:
     """
-    # Pattern: B followed by 9 alphanumeric characters (most ASINs start with B)
-    pattern = r'\b(B[A-Z0-9]{9})\b'
-    match = re.search(pattern, text.upper())
-    if match:
-        return match.group(1)
+    Check an extraction for problems DateCalculator would fail on.
     
-    # Fallback: any 10-character alphanumeric code
-    pattern = r'\b([A-Z0-9]{10})\b'
-    match = re.search(pattern, text.upper())
-    if match:
-        potential_asin = match.group(1)
-        if validate_asin(potential_asin):
-            return potential_asin
+    Returns None when valid, otherwise feedback for the retry prompt.
+    """
+    periods = (
+        ("date", extraction.date_start_label, extraction.date_end_label,
+         extraction.explicit_date_start, extraction.explicit_date_end, extraction.custom_days_count),
+        ("compare_date", extraction.compare_date_start_label, extraction.compare_date_end_label,
+         extraction.explicit_compare_start, extraction.explicit_compare_end, extraction.custom_compare_days_count),
+    )
+    for prefix, start_label, end_label, explicit_start, explicit_end, days in periods:
+        if bool(start_label) != bool(end_label):
+            return f"{prefix}_start_label and {prefix}_end_label must both be set or both be null."
+        
+        start_date = _iso_or_none(explicit_start)
+        end_date = _iso_or_none(explicit_end)
+        if start_label == "explicit_date" and start_date is None:
+            return f"{prefix}_start_label is 'explicit_date' but its explicit date is missing or not YYYY-MM-DD."
+        if end_label == "explicit_date" and end_date is None:
+            return f"{prefix}_end_label is 'explicit_date' but its explicit date is missing or not YYYY-MM-DD."
+        if start_date and end_date and start_date > end_date:
+            return f"The {prefix} period starts ({explicit_start}) after it ends ({explicit_end})."
+        
+        if "past_days" in (start_label, end_label) and not (days and days > 0):
+            return f"{prefix} label 'past_days' requires a positive days count."
     
     return None
 
 
-def label_normalizer_node(state: AgentState) -> AgentState:
+def _apply_extraction(state: AgentState, extraction: LabelExtraction) -> AgentState:
+    """Copy extracted labels, date metadata and ASIN onto the graph state."""
+    # One update instead of a setitem per field
+    state.update({
+        "_date_start_label": extraction.date_start_label,
+        "_date_end_label": extraction.date_end_label,
+        "_compare_date_start_label": extraction.compare_date_start_label,
+        "_compare_date_end_label": extraction.compare_date_end_label,
+        
+        # Metadata for explicit dates
+        "_explicit_date_start": extraction.explicit_date_start,
+        "_explicit_date_end": extraction.explicit_date_end,
+        "_explicit_compare_start": extraction.explicit_compare_start,
+        "_explicit_compare_end": extraction.explicit_compare_end,
+        
+        # Metadata for custom days
+        "_custom_days_count": extraction.custom_days_count,
+        "_custom_compare_days_count": extraction.custom_compare_days_count,
+        
+        # ASIN
+        "asin": extraction.asin,
+    })
+    
+    logger.info("📊 Extracted labels: start=%s, end=%s", extraction.date_start_label, extraction.date_end_label)
+    if extraction.compare_date_start_label:
+        logger.info("📊 Comparison labels: start=%s, end=%s", extraction.compare_date_start_label, extraction.compare_date_end_label)
+    
+    return state
+
+
+def warmup() -> None:
+    """Build the node's lazy singletons at startup instead of on the first request."""
+    settings = get_settings()
+    current_date = datetime.now(_PST_TZ).date()
+    _get_extraction_llm(settings.label_normalizer_model)
+    _prompt_chunks(current_date.year)
+    _try_fast_extraction("sales yesterday", current_date)
+    _persistent_cache.warm()
+
+
+async def label_normalizer_node(state: AgentState) -> AgentState:
     """
     FIRST NODE: Extracts date labels and ASIN from user question.
     
@@ -109,116 +492,136 @@ def label_normalizer_node(state: AgentState) -> AgentState:
     - Extracts date labels for primary and comparison periods
     - Extracts ASIN (if present)
     - Validates and corrects ASIN using regex
-    - Supports feedback-driven regeneration from Node 3 evaluator
+    - Re-asks the LLM once, with feedback, if deterministic validation fails
     """
     
     question = state["question"]
     
-    logger.info(f"🔍 Extracting labels from: '{question}'")
+    logger.info("🔍 Extracting labels from: '%s'", question)
+    
+    # Read the clock once per request: the fast path, the prompt's current
+    # year and the future-date check below share the same PST "today"
+    current_date = datetime.now(_PST_TZ).date()
+    current_year = current_date.year
+    
+    # Skip the LLM round trip when the question is unambiguous
+    fast_extraction = _try_fast_extraction(question, current_date)
+    if fast_extraction is not None:
+        logger.info("⚡ Fast-path extraction (no LLM): %s, ASIN %s", fast_extraction.date_start_label, fast_extraction.asin)
+        return _apply_extraction(state, fast_extraction)
     
     settings = get_settings()
-    llm = ChatOpenAI(
-        model=settings.openai_model,
-        temperature=0,
-        api_key=settings.openai_api_key,
-        streaming=True
-    )
     
-    # Bind structured output
-    llm_with_structure = llm.with_structured_output(LabelExtraction)
+    # Regex is authoritative for B0-prefixed codes: take the ASIN up front and
+    # mask it, so the LLM (and both caches) only ever see the date phrasing
+    regex_asin = extract_asin_from_text(" ".join(_ASIN_MASK_RE.findall(question)))
+    masked_question = _ASIN_MASK_RE.sub("ASIN", question)
     
-    # Get current year for explicit dates
-    from datetime import datetime
-    current_year = datetime.now().year
+    cache_key = (" ".join(masked_question.split()), current_date.isoformat())
+    cached_json = _extraction_cache.get(cache_key)
+    if cached_json is not None:
+        _extraction_cache.move_to_end(cache_key)
+    else:
+        cached_json = _persistent_cache.get(cache_key)
+        if cached_json is not None:
+            _extraction_cache[cache_key] = cached_json
+            if len(_extraction_cache) > _EXTRACTION_CACHE_SIZE:
+                _extraction_cache.popitem(last=False)
+    if cached_json is not None:
+        logger.info("♻️ Extraction cache hit (no LLM)")
+        extraction = LabelExtraction.model_validate_json(cached_json)
+        extraction.asin = regex_asin or extraction.asin
+        return _apply_extraction(state, extraction)
     
-    # Create prompt
-    prompt = LABEL_NORMALIZER_PROMPT.format(
-        question=question,
-        current_year=current_year,
-        feedback_section="No previous feedback (first attempt).",
-        feedback_reminder=""
+    semantic_scope = scope_key(
+        current_date.isoformat(),
+        *(token.group(0).lower() for token in _DATE_TOKEN_RE.finditer(masked_question))
     )
+    embedding = await _LABEL_CACHE.aembed(masked_question)
+    cached_json = _LABEL_CACHE.lookup(embedding, semantic_scope)
+    if cached_json is not None:
+        extraction = LabelExtraction.model_validate_json(cached_json)
+        extraction.asin = regex_asin
+        return _apply_extraction(state, extraction)
+    
+    feedback_section = "No previous feedback (first attempt)."
+    feedback_reminder = ""
+    batch_window_seconds = settings.label_batch_window_ms / 1000
     
     try:
-        extraction = llm_with_structure.invoke(prompt)
-        
-        # Adjust explicit dates if they're in the future (map to previous year)
-        def adjust_future_date(date_str: str) -> str:
-            """If date is in the future, adjust to previous year."""
-            if not date_str:
-                return date_str
+        # Single pass in the common case; re-ask only on a genuine validation failure
+        for attempt in range(1, _MAX_EXTRACTION_ATTEMPTS + 1):
+            if attempt == 1 and batch_window_seconds > 0:
+                # First attempts may share one LLM call with concurrent requests
+                extraction = await _label_batcher.extract(
+                    masked_question, settings.label_normalizer_model, current_year, batch_window_seconds
+                )
+            else:
+                # The small label model goes first; a retry escalates to the main model
+                model = settings.label_normalizer_model if attempt == 1 else settings.openai_model
+                prompt = _format_extraction_prompt(masked_question, current_year, feedback_section, feedback_reminder)
+                extraction = await _get_extraction_llm(model).ainvoke(prompt)
             
-            try:
-                from datetime import datetime
-                from zoneinfo import ZoneInfo
-                
-                pst_tz = ZoneInfo("America/Los_Angeles")
-                current_date = datetime.now(pst_tz).date()
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
-                
-                # If the date is in the future, use previous year
-                if date_obj > current_date:
-                    adjusted_year = date_obj.year - 1
-                    adjusted_date = date_obj.replace(year=adjusted_year)
-                    logger.info(f"📅 Adjusted future date {date_str} → {adjusted_date.strftime('%Y-%m-%d')}")
-                    return adjusted_date.strftime("%Y-%m-%d")
-                
-                return date_str
-            except Exception as e:
-                logger.warning(f"⚠️ Could not adjust date {date_str}: {e}")
-                return date_str
-        
-        # Apply adjustment to all explicit dates
-        if extraction.date_start_label == "explicit_date":
-            extraction.explicit_date_start = adjust_future_date(extraction.explicit_date_start)
-        if extraction.date_end_label == "explicit_date":
-            extraction.explicit_date_end = adjust_future_date(extraction.explicit_date_end)
-        if extraction.compare_date_start_label == "explicit_date":
-            extraction.explicit_compare_start = adjust_future_date(extraction.explicit_compare_start)
-        if extraction.compare_date_end_label == "explicit_date":
-            extraction.explicit_compare_end = adjust_future_date(extraction.explicit_compare_end)
+            # Apply adjustment to all explicit dates
+            if extraction.date_start_label == "explicit_date":
+                extraction.explicit_date_start = _adjust_future_date(extraction.explicit_date_start, current_date)
+            if extraction.date_end_label == "explicit_date":
+                extraction.explicit_date_end = _adjust_future_date(extraction.explicit_date_end, current_date)
+            if extraction.compare_date_start_label == "explicit_date":
+                extraction.explicit_compare_start = _adjust_future_date(extraction.explicit_compare_start, current_date)
+            if extraction.compare_date_end_label == "explicit_date":
+                extraction.explicit_compare_end = _adjust_future_date(extraction.explicit_compare_end, current_date)
+            
+            feedback = _validate_extraction(extraction)
+            if feedback is None:
+                break
+            logger.warning("⚠️ Extraction attempt %s failed validation: %s", attempt, feedback)
+            feedback_section = feedback
+            feedback_reminder = f"12. **Fix the previous issue:** {feedback}"
         
         # Validate ASIN if extracted
-        if extraction.asin:
-            # Try to extract from original text first (more reliable)
-            extracted_asin = extract_asin_from_text(question)
-            if extracted_asin:
-                extraction.asin = extracted_asin
-                logger.info(f"📦 ASIN found: {extraction.asin}")
-            elif not validate_asin(extraction.asin):
-                logger.warning(f"❌ Invalid ASIN format: {extraction.asin}, setting to None")
-                extraction.asin = None
+        if regex_asin:
+            extraction.asin = regex_asin
+            logger.info("📦 ASIN found: %s", extraction.asin)
+        elif extraction.asin:
+            if validate_asin(extraction.asin):
+                # Well-formed already; no need to re-scan the question
+                extraction.asin = extraction.asin.upper()
+                logger.info("📦 ASIN found: %s", extraction.asin)
+            else:
+                extracted_asin = extract_asin_from_text(question)
+                if extracted_asin:
+                    extraction.asin = extracted_asin
+                    logger.info("📦 ASIN found: %s", extraction.asin)
+                else:
+                    logger.warning("❌ Invalid ASIN format: %s, setting to None", extraction.asin)
+                    extraction.asin = None
+        
+        logger.info("✅ Extraction completed")
         
-        logger.info(f"✅ Extraction completed")
+        if feedback is None:
+            # Entries are ASIN-free when the ASIN came from the regex, so one
+            # phrasing serves every product; an ASIN only the LLM found
+            # stays in the exact entry and keeps it out of the semantic cache
+            cached = extraction.model_copy(update={"asin": None}) if regex_asin else extraction
+            # Serialized once for all three tiers; None fields fall back to
+            # their defaults on model_validate_json, so they are left out
+            cached_json = cached.model_dump_json(exclude_none=True)
+            _extraction_cache[cache_key] = cached_json
+            if len(_extraction_cache) > _EXTRACTION_CACHE_SIZE:
+                _extraction_cache.popitem(last=False)
+            _persistent_cache.set(cache_key, cached_json)
+            if cached.asin is None:
+                _LABEL_CACHE.store(embedding, cached_json, semantic_scope)
                 
     except Exception as e:
-        logger.error(f"❌ Error extracting labels: {e}")
+        logger.error("❌ Error extracting labels: %s", e)
         # Return state with error (extraction will be None)
         return state
     
     # Update state with extracted information
     if extraction:
-        state["_date_start_label"] = extraction.date_start_label
-        state["_date_end_label"] = extraction.date_end_label
-        state["_compare_date_start_label"] = extraction.compare_date_start_label
-        state["_compare_date_end_label"] = extraction.compare_date_end_label
-        
-        # Metadata for explicit dates
-        state["_explicit_date_start"] = extraction.explicit_date_start
-        state["_explicit_date_end"] = extraction.explicit_date_end
-        state["_explicit_compare_start"] = extraction.explicit_compare_start
-        state["_explicit_compare_end"] = extraction.explicit_compare_end
-        
-        # Metadata for custom days
-        state["_custom_days_count"] = extraction.custom_days_count
-        state["_custom_compare_days_count"] = extraction.custom_compare_days_count
-        
-        # ASIN
-        state["asin"] = extraction.asin
-        
-        logger.info(f"📊 Extracted labels: start={extraction.date_start_label}, end={extraction.date_end_label}")
-        if extraction.compare_date_start_label:
-            logger.info(f"📊 Comparison labels: start={extraction.compare_date_start_label}, end={extraction.compare_date_end_label}")
+        _apply_extraction(state, extraction)
     
     return state
 
@@ -17,7 +17,7 @@ LABEL_NORMALIZER_PROMPT = """You are a label extractor that extracts date labels
 - past_7_days, past_14_days, past_30_days, past_60_days, past_90_days, past_180_days
 
 **IMPORTANT: "Past X Weeks" = Convert to Days (SINGLE PERIOD)**
-- "past 2 weeks" = "past week" = last 14 days → past_14_days ✅
+- "past 2 weeks" = "past week" = last 14 days → past_14_days
 - "past 3 weeks" = last 21 days → past_days + custom_days_count=21
 - "past 4 weeks" = last 28 days → past_days + custom_days_count=28
 - These are SINGLE time periods (date_start = X*7 days ago, date_end = today)
@@ -47,7 +47,7 @@ LABEL_NORMALIZER_PROMPT = """You are a label extractor that extracts date labels
 
 **Rule 1: ANY SPECIFIC DAY REFERENCE = explicit_date (MOST IMPORTANT)**
 
-⚠️ WHENEVER a specific day is mentioned (in ANY format), you MUST use "explicit_date".
+WHENEVER a specific day is mentioned (in ANY format), you MUST use "explicit_date".
 
 ALL these patterns require "explicit_date":
 
@@ -68,7 +68,7 @@ ALL these patterns require "explicit_date":
 **Pattern E: Full Date with Year**
 - "December 1, 2025", "2025-12-01", "1 Jan 2025", "Jan 1st, 2025"
 
-✅ CORRECT EXTRACTIONS:
+Correct extractions:
 - "dec 1" → explicit_date + explicit_date_start="{current_year}-12-01"
 - "1 dec" → explicit_date + explicit_date_start="{current_year}-12-01"
 - "jan 3" → explicit_date + explicit_date_start="{current_year}-01-03"
@@ -81,21 +81,20 @@ ALL these patterns require "explicit_date":
 - "December 1, 2025" → explicit_date + explicit_date_start="2025-12-01"
 - "1 Jan 2025" → explicit_date + explicit_date_start="2025-01-01"
 
-❌ WRONG (DO NOT DO THIS):
+Wrong (do not do this):
 - "dec 1" → december (WRONG! "1" is a day number!)
 - "3 jan" → january (WRONG! "3" is a day number!)
 - "third Jan" → january (WRONG! "third" means day 3!)
 - "last day of december" → december (WRONG! Specific day implied!)
 
 ONLY use month labels when the month appears COMPLETELY ALONE with no day:
-- "in December" → december ✅
-- "December performance" → december ✅
-- "for the month of September" → september ✅
+- "in December" → december
+- "December performance" → december
+- "for the month of September" → september
 
 **Rule 2: Use specific predefined labels when possible**
 
-❌ WRONG: "past 7 days" → "past_days" + custom_days_count=7
-✅ CORRECT: "past 7 days" → "past_7_days"
+"past 7 days" → "past_7_days" (NOT "past_days" + custom_days_count=7)
 
 Only use "past_days" for unusual counts:
 - "past 9 days" → "past_days" + custom_days_count=9
@@ -103,8 +102,7 @@ Only use "past_days" for unusual counts:
 
 **Rule 3: Date range labels MUST match within each period**
 
-✅ CORRECT: date_start_label="september", date_end_label="september" (SAME)
-❌ WRONG: date_start_label="september", date_end_label="december" (DIFFERENT)
+Example: date_start_label="september", date_end_label="september" (never "september" with "december")
 
 For a single time period, both start and end MUST use the SAME label.
 
@@ -116,24 +114,24 @@ Extract each period separately:
 
 **CRITICAL: Always put the more recent period as PRIMARY, regardless of word order in the question.**
 
-**IMPORTANT**: If the question does NOT contain comparison keywords (compare, vs, versus, to, versus, against), 
+**IMPORTANT**: If the question does NOT contain comparison keywords (compare, vs, versus, to, against), 
 set compare_date_start_label and compare_date_end_label to null.
 
 Examples:
 - "Compare September to December" → December is more recent
-  - Primary: date_start_label="december", date_end_label="december" ✅ (more recent)
+  - Primary: date_start_label="december", date_end_label="december" (more recent)
   - Comparison: compare_date_start_label="september", compare_date_end_label="september" (earlier)
 
 - "Compare past week with this week" → This week is more recent
-  - Primary: date_start_label="this_week", date_end_label="this_week" ✅ (more recent)
+  - Primary: date_start_label="this_week", date_end_label="this_week" (more recent)
   - Comparison: compare_date_start_label="last_week", compare_date_end_label="last_week" (earlier)
 
 - "Compare today and yesterday" → Today is more recent
-  - Primary: date_start_label="today", date_end_label="today" ✅ (more recent)
+  - Primary: date_start_label="today", date_end_label="today" (more recent)
   - Comparison: compare_date_start_label="yesterday", compare_date_end_label="yesterday" (earlier)
 
 - "Compare yesterday and today" → Today is more recent (same result despite word order)
-  - Primary: date_start_label="today", date_end_label="today" ✅ (more recent)
+  - Primary: date_start_label="today", date_end_label="today" (more recent)
   - Comparison: compare_date_start_label="yesterday", compare_date_end_label="yesterday" (earlier)
 
 - "What is today's ROI" → (NO comparison)
@@ -142,10 +140,8 @@ Examples:
 
 **Rule 5: Explicit dates default to current year**
 
-If no year mentioned, use: {current_year}
-- "October 15" → explicit_date_start="{current_year}-10-15"
+If no year is mentioned, use {current_year}; a year the user gives always wins.
 - "Dec 3" → explicit_date_start="{current_year}-12-03"
-- "3 jan" → explicit_date_start="{current_year}-01-03"
 
 **Rule 6: ASIN Extraction**
 
@@ -159,21 +155,19 @@ If no year mentioned, use: {current_year}
 
 ## Examples
 
-**Example 1: Day + Month format**
-Question: "Show me sales for 3 jan"
+**Example 1: MONTH LABEL - Month alone (no day)**
+Question: "Show me December sales"
 Output:
-- date_start_label: "explicit_date"  ← NOT january!
-- date_end_label: "explicit_date"
-- explicit_date_start: "{current_year}-01-03"
-- explicit_date_end: "{current_year}-01-03"
+- date_start_label: "december"  ← Month alone, use month label
+- date_end_label: "december"
 - compare_date_start_label: null
 - compare_date_end_label: null
 - asin: null
 
-**Example 2: Ordinal + Month format**
-Question: "What was third Jan performance"
+**Example 2: Day + Month format**
+Question: "Show me sales for 3 jan"
 Output:
-- date_start_label: "explicit_date"  ← "third" = day 3!
+- date_start_label: "explicit_date"  ← NOT january!
 - date_end_label: "explicit_date"
 - explicit_date_start: "{current_year}-01-03"
 - explicit_date_end: "{current_year}-01-03"
@@ -181,18 +175,7 @@ Output:
 - compare_date_end_label: null
 - asin: null
 
-**Example 3: Last day of month**
-Question: "Sales on last day of december"
-Output:
-- date_start_label: "explicit_date"  ← Specific day implied!
-- date_end_label: "explicit_date"
-- explicit_date_start: "{current_year}-12-31"
-- explicit_date_end: "{current_year}-12-31"
-- compare_date_start_label: null
-- compare_date_end_label: null
-- asin: null
-
-**Example 4: Full date with year**
+**Example 3: Full date with year**
 Question: "Performance on 1 Jan 2025"
 Output:
 - date_start_label: "explicit_date"
@@ -203,27 +186,7 @@ Output:
 - compare_date_end_label: null
 - asin: null
 
-**Example 5: Month + Day format**
-Question: "Show me dec 1 results"
-Output:
-- date_start_label: "explicit_date"  ← NOT december!
-- date_end_label: "explicit_date"
-- explicit_date_start: "{current_year}-12-01"
-- explicit_date_end: "{current_year}-12-01"
-- compare_date_start_label: null
-- compare_date_end_label: null
-- asin: null
-
-**Example 6: MONTH LABEL - Month alone (no day)**
-Question: "Show me December sales"
-Output:
-- date_start_label: "december"  ← Month alone, use month label
-- date_end_label: "december"
-- compare_date_start_label: null
-- compare_date_end_label: null
-- asin: null
-
-**Example 7: Date range with explicit dates**
+**Example 4: Date range with explicit dates**
 Question: "Sales from 1 Oct to 15 Oct"
 Output:
 - date_start_label: "explicit_date"
@@ -234,7 +197,7 @@ Output:
 - compare_date_end_label: null
 - asin: null
 
-**Example 8: Simple relative (NO comparison)**
+**Example 5: Simple relative (NO comparison)**
 Question: "Show me yesterday's sales"
 Output:
 - date_start_label: "yesterday"
@@ -243,7 +206,7 @@ Output:
 - compare_date_end_label: null
 - asin: null
 
-**Example 9: Custom days (NO comparison)**
+**Example 6: Custom days (NO comparison)**
 Question: "Past 23 days performance"
 Output:
 - date_start_label: "past_days"
@@ -253,7 +216,7 @@ Output:
 - compare_date_end_label: null
 - asin: null
 
-**Example 10: Past 2 weeks = Single 14-day period (NO comparison)**
+**Example 7: Past 2 weeks = Single 14-day period (NO comparison)**
 Question: "What happened to my performance over the past 2 weeks"
 Output:
 - date_start_label: "past_14_days"  ← 2 weeks = 14 days (SINGLE period)
@@ -262,16 +225,6 @@ Output:
 - compare_date_end_label: null
 - asin: null
 
-**Example 11: Past 3 weeks = Single 21-day period (NO comparison)**
-Question: "Show me past 3 weeks trends"
-Output:
-- date_start_label: "past_days"  ← 3 weeks = 21 days (custom count)
-- date_end_label: "past_days"
-- custom_days_count: 21
-- compare_date_start_label: null  ← NOT a comparison!
-- compare_date_end_label: null
-- asin: null
-
 ---
 
 ## Previous Evaluation Feedback
@@ -1,17 +1,17 @@
 import logging
-from datetime import datetime, timezone
 
 from app.models.agentState import AgentState
-from app.utils.date_calculator import DateCalculator
+from app.utils.date_calculator import get_calculator
 
 logger = logging.getLogger(__name__)
 
 
-def message_analyzer_node(state: AgentState) -> AgentState:
+async def message_analyzer_node(state: AgentState) -> AgentState:
     """
     Message analyzer (Node 2): Converts date labels to actual ISO dates.
     
-    This is a pure Python deterministic node (no AI/LLM calls).
+    This is a pure Python deterministic node (no AI/LLM calls). It is declared
+    async so LangGraph runs it on the event loop instead of a worker thread.
     
     Inputs (from Node 1 - label_normalizer):
         - _date_start_label, _date_end_label
@@ -34,8 +34,8 @@ def message_analyzer_node(state: AgentState) -> AgentState:
     
     logger.info("📅 Message Analyzer: Calculating dates from labels")
     
-    # Initialize calculator with current date
-    calculator = DateCalculator()
+    # Shared calculator for today's date (rebuilt only when the day changes)
+    calculator = get_calculator()
     
     # Get extracted labels from state
     date_start_label = state.get("_date_start_label")
@@ -53,20 +53,17 @@ def message_analyzer_node(state: AgentState) -> AgentState:
     try:
         # Calculate primary date range (REQUIRED)
         if date_start_label and date_end_label:
-            start_date, _ = calculator.calculate(
-                label=date_start_label,
-                explicit_date=explicit_start,
-                custom_days=custom_days
-            )
-            _, end_date = calculator.calculate(
-                label=date_end_label,
-                explicit_date=explicit_end,
+            start_date, end_date = calculator.calculate_range(
+                date_start_label,
+                date_end_label,
+                explicit_start=explicit_start,
+                explicit_end=explicit_end,
                 custom_days=custom_days
             )
             
             state["date_start"] = start_date
             state["date_end"] = end_date
-            logger.info(f"✅ Primary range: {start_date} to {end_date}")
+            logger.info("✅ Primary range: %s to %s", start_date, end_date)
         else:
             # Fallback to default (past 7 days)
             logger.warning("⚠️ No date labels found, using default (past_7_days)")
@@ -76,26 +73,23 @@ def message_analyzer_node(state: AgentState) -> AgentState:
         
         # Calculate comparison date range (OPTIONAL)
         if compare_start_label and compare_end_label:
-            compare_start, _ = calculator.calculate(
-                label=compare_start_label,
-                explicit_date=explicit_compare_start,
-                custom_days=state.get("_custom_compare_days_count")
-            )
-            _, compare_end = calculator.calculate(
-                label=compare_end_label,
-                explicit_date=explicit_compare_end,
+            compare_start, compare_end = calculator.calculate_range(
+                compare_start_label,
+                compare_end_label,
+                explicit_start=explicit_compare_start,
+                explicit_end=explicit_compare_end,
                 custom_days=state.get("_custom_compare_days_count")
             )
             
             state["compare_date_start"] = compare_start
             state["compare_date_end"] = compare_end
-            logger.info(f"✅ Comparison range: {compare_start} to {compare_end}")
+            logger.info("✅ Comparison range: %s to %s", compare_start, compare_end)
         else:
             state["compare_date_start"] = None
             state["compare_date_end"] = None
     
     except Exception as e:
-        logger.error(f"❌ Error calculating dates: {e}")
+        logger.error("❌ Error calculating dates: %s", e)
         # Fallback to safe default
         start_date, end_date = calculator.calculate("default")
         state["date_start"] = start_date
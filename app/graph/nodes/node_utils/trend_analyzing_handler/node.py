@@ -14,13 +14,16 @@ Handles questions like:
 """
 
 import logging
-from datetime import datetime, timedelta
+import string
+from datetime import date, timedelta
 
-from langchain_openai import ChatOpenAI
+from langchain_core.messages import HumanMessage, SystemMessage
 
 from app.models.agentState import AgentState
 from app.config import get_settings
+from app.utils.llm import get_chat_llm
 from app.metricsAccessLayer import metrics_api
+from app.utils.date_calculator import format_date_range
 from app.utils.trend_metrics_fetcher import fetch_trend_metrics
 from app.utils.button_helpers import create_set_goal_button
 from app.graph.nodes.classifier_route_node.insight_query_handler.prompt import (
@@ -29,29 +32,22 @@ from app.graph.nodes.classifier_route_node.insight_query_handler.prompt import (
 
 logger = logging.getLogger(__name__)
 
+# Per-request half of the trend prompt (the static TREND_ANALYSIS_PROMPT is sent
+# as the system message). Parsed once; values are pre-formatted strings.
+_TREND_DATA_TEMPLATE = string.Template("""**User-Set Goals:**
+$goals_text
 
-def _format_date_range(start_str: str, end_str: str) -> str:
-    """
-    Format date range like metrics_query_handler: (Sep 1-14, 2025)
-    - Same month: "Sep 1-14, 2025"
-    - Different months: "Sep 1 - Oct 14, 2025"
-    - Single day: "Sep 1, 2025"
-    """
-    start = datetime.strptime(start_str, "%Y-%m-%d")
-    end = datetime.strptime(end_str, "%Y-%m-%d")
-    
-    if start == end:
-        # Single day: "Sep 1, 2025"
-        return start.strftime("%b %-d, %Y")
-    elif start.month == end.month and start.year == end.year:
-        # Same month: "Sep 1-14, 2025"
-        return f"{start.strftime('%b')} {start.day}-{end.day}, {start.year}"
-    elif start.year == end.year:
-        # Different months, same year: "Sep 1 - Oct 14, 2025"
-        return f"{start.strftime('%b')} {start.day} - {end.strftime('%b')} {end.day}, {start.year}"
-    else:
-        # Different years: "Dec 15, 2024 - Jan 14, 2025"
-        return f"{start.strftime('%b')} {start.day}, {start.year} - {end.strftime('%b')} {end.day}, {end.year}"
+**Daily Metrics Data:**
+$text
+
+**Summary Statistics:**
+- Net Profit: Sum=$$$profit_sum, Avg=$$$profit_avg, Max=$$$profit_max, Min=$$$profit_min
+- ACOS Avg: $acos_avg%
+- Ad TOS IS Avg: $ad_tos_is_avg%
+
+**User Question:** $question
+
+**Analysis:**""")
 
 
 def _calculate_next_period(date_end: str) -> tuple[str, str]:
@@ -59,53 +55,50 @@ def _calculate_next_period(date_end: str) -> tuple[str, str]:
     Calculate the next recommended goal period.
     Starts the day after analysis period ends, with a 15-day window.
     """
-    end = datetime.strptime(date_end, "%Y-%m-%d")
+    end = date.fromisoformat(date_end)
     next_start = end + timedelta(days=1)
     next_end = next_start + timedelta(days=14)  # 15-day window
-    return next_start.strftime("%Y-%m-%d"), next_end.strftime("%Y-%m-%d")
+    return next_start.isoformat(), next_end.isoformat()
 
 
-def _generate_trend_analysis_response(data: dict, question: str) -> str:
+async def _generate_trend_analysis_response(data: dict, question: str) -> str:
     """
     Generate LLM analysis for trend data.
     
     Uses TREND_ANALYSIS_PROMPT to identify trends in net profit,
     correlate with user goals first, then other metrics, and explain root causes.
+    Awaits the streaming model so tokens reach astream_events as they arrive.
     """
     # Check if we have any data
     if not data.get('stats') or data.get('days', 0) == 0:
         return f"No data available for the requested period. {data.get('text', '')}"
     
-    settings = get_settings()
-    llm = ChatOpenAI(
-        model=settings.openai_model,
-        temperature=0.3,
-        api_key=settings.openai_api_key,
-        streaming=True
-    )
+    llm = get_chat_llm(get_settings().openai_model, 0.3)
     
     # Build summary statistics only if stats exist
     stats = data.get('stats', {})
     profit_stats = stats.get('profit', {})
     
-    prompt = f"""{TREND_ANALYSIS_PROMPT}
-
-**User-Set Goals:**
-{data.get('goals_text', 'No active goals during this period.')}
-
-**Daily Metrics Data:**
-{data['text']}
-
-**Summary Statistics:**
-- Net Profit: Sum=${profit_stats.get('sum', 0):,}, Avg=${profit_stats.get('avg', 0):,}, Max=${profit_stats.get('max', 0):,}, Min=${profit_stats.get('min', 0):,}
-- ACOS Avg: {stats.get('acos_avg', 0):.2f}%
-- Ad TOS IS Avg: {stats.get('ad_tos_is_avg', 0):.2f}%
-
-**User Question:** {question}
-
-**Analysis:**"""
+    # Static instructions go in the system message so they form a stable,
+    # cacheable prompt prefix; only the data/question below change per call
+    dynamic_block = _TREND_DATA_TEMPLATE.substitute(
+        goals_text=data.get('goals_text', 'No active goals during this period.'),
+        text=data['text'],
+        profit_sum=f"{profit_stats.get('sum', 0):,}",
+        profit_avg=f"{profit_stats.get('avg', 0):,}",
+        profit_max=f"{profit_stats.get('max', 0):,}",
+        profit_min=f"{profit_stats.get('min', 0):,}",
+        acos_avg=f"{stats.get('acos_avg', 0):.2f}",
+        ad_tos_is_avg=f"{stats.get('ad_tos_is_avg', 0):.2f}",
+        question=question
+    )
     
-    response = llm.invoke(prompt)
+    response = await llm.ainvoke([
+        SystemMessage(content=TREND_ANALYSIS_PROMPT),
+        HumanMessage(content=dynamic_block)
+    ])
+    cached_tokens = (response.usage_metadata or {}).get("input_token_details", {}).get("cache_read", 0)
+    logger.debug("Trend analysis prompt cache read tokens: %s", cached_tokens)
     return response.content.strip()
 
 
@@ -187,7 +180,7 @@ async def _get_optimization_potential(
         
         # Calculate the next period for recommendations
         next_start, next_end = _calculate_next_period(date_end)
-        next_period_range = _format_date_range(next_start, next_end)
+        next_period_range = format_date_range(next_start, next_end)
         
         # Round ACOS to whole number for display and button
         acos_rounded = round(acos_value)
@@ -260,7 +253,7 @@ async def trend_analyzing_handler_node(state: AgentState) -> dict:
     )
     
     # Generate trend analysis from LLM
-    trend_response = _generate_trend_analysis_response(data, question)
+    trend_response = await _generate_trend_analysis_response(data, question)
     
     # Fetch non-optimal potential and optimization recommendations in parallel
     non_optimal_text, optimization_text = await asyncio.gather(
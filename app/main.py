@@ -4,17 +4,52 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, AsyncIterator
+from contextlib import asynccontextmanager
+from langchain_openai import ChatOpenAI
+import asyncio
 import logging
 import json
 
 from app.config import get_settings
 from app.context import RequestContext
 from app.graph.builder import create_chatbot_graph
+from app.graph.nodes.label_normalizer.node import warmup as warm_label_normalizer
+from app.metricsAccessLayer import close_shared_client
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Nyle Chatbot", version="1.0.0")
+
+async def _warm_openai_pool():
+    """
+    Open a pooled connection to OpenAI before the first user turn.
+    
+    All ChatOpenAI instances share langchain-openai's default httpx client, so
+    one cheap models.list() call pays the TLS handshake up front for every node.
+    """
+    try:
+        llm = ChatOpenAI(model=settings.openai_model, api_key=settings.openai_api_key)
+        await llm.root_async_client.models.list()
+        logger.info("OpenAI connection pool warmed")
+    except Exception as e:
+        logger.warning("OpenAI warmup failed (continuing): %s", e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """App startup/shutdown hooks."""
+    # Local one-time setup (LLM client, prompt chunks, cache file) for the first node
+    warm_label_normalizer()
+    # Fire-and-forget so startup is not blocked on the network
+    warmup = asyncio.create_task(_warm_openai_pool())
+    yield
+    if not warmup.done():
+        warmup.cancel()
+    # Release pooled backend connections
+    await close_shared_client()
+
+
+app = FastAPI(title="Nyle Chatbot", version="1.0.0", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -211,6 +246,12 @@ async def chatbot(
                             if chunk and hasattr(chunk, "content") and chunk.content:
                                 yield f"event: token\ndata: {json.dumps({'token': chunk.content})}\n\n"
                         
+                        # Responses built without an LLM call arrive as a single custom event
+                        elif kind == "on_custom_event" and event.get("name") == "response_token":
+                            token = event.get("data", {}).get("token")
+                            if token:
+                                yield f"event: token\ndata: {json.dumps({'token': token})}\n\n"
+                        
                         # Capture final state for metadata
                         elif kind == "on_chain_end":
                             output = event.get("data", {}).get("output", {})
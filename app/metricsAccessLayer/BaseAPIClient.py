@@ -1,5 +1,6 @@
+import asyncio
 import httpx
-from typing import Optional
+from typing import Dict, Optional
 import logging
 
 from app.config import get_settings
@@ -7,10 +8,68 @@ from app.context import get_jwt_token
 
 logger = logging.getLogger(__name__)
 
+# Shared connection pool (keep-alive + HTTP/2) and per-endpoint limiters, one
+# set per event loop: an AsyncClient and asyncio.Semaphore only work on the loop
+# they were first used on, and scripts, evals and tests may run several loops
+# in turn. Created lazily on first request; closed from the app lifespan.
+_shared_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+# Max in-flight requests per backend endpoint. Extra callers wait their turn
+# instead of piling onto an already saturated endpoint (and tripping 429s).
+MAX_CONCURRENCY_PER_ENDPOINT = 8
+_endpoint_semaphores: Dict[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]] = {}
+
+
+def _drop_closed_loops() -> None:
+    """Forget clients and limiters of event loops that have since closed."""
+    for registry in (_shared_clients, _endpoint_semaphores):
+        for loop in [loop for loop in registry if loop.is_closed()]:
+            del registry[loop]
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Get the running loop's AsyncClient, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _shared_clients.get(loop)
+    if client is None or client.is_closed:
+        _drop_closed_loops()
+        # Every request passes its own timeout; this is only the fallback
+        client = _shared_clients[loop] = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=30.0
+        )
+    return client
+
+
+def _endpoint_semaphore(endpoint: str) -> asyncio.Semaphore:
+    """Get the running loop's limiter for an endpoint path, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    semaphores = _endpoint_semaphores.get(loop)
+    if semaphores is None:
+        _drop_closed_loops()
+        semaphores = _endpoint_semaphores[loop] = {}
+    semaphore = semaphores.get(endpoint)
+    if semaphore is None:
+        semaphore = semaphores[endpoint] = asyncio.Semaphore(MAX_CONCURRENCY_PER_ENDPOINT)
+    return semaphore
+
+
+async def close_shared_client():
+    """Close the running loop's AsyncClient (call on app shutdown)."""
+    loop = asyncio.get_running_loop()
+    _endpoint_semaphores.pop(loop, None)
+    client = _shared_clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
 
 class BaseAPIClient:
     """
     Base HTTP client with environment-aware URL selection.
+    
+    All instances share one pooled httpx.AsyncClient so TCP/TLS connections
+    are reused across requests instead of re-established per call.
     """
     
     def __init__(self):
@@ -45,14 +104,15 @@ class BaseAPIClient:
         logger.info(f"GET {url} with params: {params}, timeout: {request_timeout}s")
         
         try:
-            async with httpx.AsyncClient(timeout=request_timeout) as client:
-                response = await client.get(
+            async with _endpoint_semaphore(endpoint):
+                response = await get_shared_client().get(
                     url,
                     headers=self._get_headers(),
-                    params=params
+                    params=params,
+                    timeout=request_timeout
                 )
-                response.raise_for_status()
-                return response.json()
+            response.raise_for_status()
+            return response.json()
         except httpx.ReadTimeout:
             logger.error(f"Timeout after {request_timeout}s calling {endpoint} with params {params}")
             raise
@@ -62,12 +122,13 @@ class BaseAPIClient:
         url = f"{self.base_url}{endpoint}"
         logger.info(f"POST {url}")
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
+        async with _endpoint_semaphore(endpoint):
+            response = await get_shared_client().post(
                 url,
                 headers=self._get_headers(),
-                json=data
+                json=data,
+                timeout=self.timeout
             )
-            response.raise_for_status()
-            return response.json()
+        response.raise_for_status()
+        return response.json()
 
@@ -12,6 +12,6 @@ Usage:
 
 from app.metricsAccessLayer.metrics_api import MathMetricRetriever, metrics_api
 from app.metricsAccessLayer.products_api import ProductsAPIClient, products_api
-from app.metricsAccessLayer.BaseAPIClient import BaseAPIClient
+from app.metricsAccessLayer.BaseAPIClient import BaseAPIClient, close_shared_client
 
-__all__ = ["MathMetricRetriever", "ProductsAPIClient", "BaseAPIClient", "metrics_api", "products_api"]
+__all__ = ["MathMetricRetriever", "ProductsAPIClient", "BaseAPIClient", "metrics_api", "products_api", "close_shared_client"]
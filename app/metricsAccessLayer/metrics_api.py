@@ -10,13 +10,28 @@ Usage anywhere in your project:
     result = await metrics_api.get_financial_summary("2025-10-01", "2025-10-31")
 """
 
-from typing import Optional
+from typing import Optional, List, Dict, Any
+import asyncio
 import logging
+import time
 
+import httpx
+import orjson
+
+from app.config import get_settings
 from app.metricsAccessLayer.BaseAPIClient import BaseAPIClient
+from app.context import get_jwt_token
 
 logger = logging.getLogger(__name__)
 
+# Identical requests (same tenant, endpoint and params) within this window
+# share one backend call: concurrent callers await the same in-flight task and
+# later callers get its result without touching the network. The response is
+# kept as JSON bytes and decoded per caller, so each caller owns its copy and
+# may modify it (e.g. truncate_decimals) without corrupting the shared entry.
+COALESCE_TTL_SECONDS = 60.0
+_COALESCE_MAX_ENTRIES = 1024
+
 
 class MathMetricRetriever:
     """
@@ -30,6 +45,14 @@ class MathMetricRetriever:
     
     _instance = None
     
+    # Flipped to False the first time a batch call fails (of any kind), so
+    # later requests go straight to the per-endpoint fallback instead of
+    # paying a failed round trip first.
+    _batch_supported = True
+    
+    # (jwt, endpoint, params) -> (expires_at, task); see _get_coalesced
+    _coalesced: Dict[tuple, tuple] = {}
+    
     def __new__(cls):
         """Singleton pattern - only create one instance."""
         if cls._instance is None:
@@ -70,7 +93,7 @@ class MathMetricRetriever:
             params["timespan"] = timespan
         
         logger.info(f"Calling {endpoint}")
-        return await self.client.get(endpoint, params)
+        return await self._get_coalesced(endpoint, params)
     
     # ========== API 2: Financial Summary ==========
     async def get_financial_summary(
@@ -334,7 +357,7 @@ class MathMetricRetriever:
 
         logger.info(f"Calling {endpoint}")
         # This endpoint is slow (~30s), use extended timeout
-        return await self.client.get(endpoint, params, timeout=60.0)
+        return await self._get_coalesced(endpoint, params, timeout=60.0)
 
     # ========== API 9: Daily ACOS ==========
     async def get_daily_acos(
@@ -574,5 +597,127 @@ class MathMetricRetriever:
         return await self.client.get(endpoint, params)
 
 
+    # ========== API 16: Batched Executive Summaries ==========
+    async def get_batched(
+        self,
+        endpoints: List[str],
+        date_start: str,
+        date_end: str,
+        timespan: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        POST /math/batch
+        
+        Fetches several executive summaries in one round-trip; the backend fans
+        out server-side and returns {"ads": {...}, "cfo": {...}, ...}.
+        
+        Args:
+            endpoints: Endpoint keys to fetch (ads, total, cfo, organic, attribution, inventory)
+            date_start: Start date (YYYY-MM-DD)
+            date_end: End date (YYYY-MM-DD)
+            timespan: Optional time granularity (e.g. "day")
+        
+        Returns:
+            Dict mapping each requested endpoint key to its response. Endpoints
+            that failed map to the raised exception (like asyncio.gather with
+            return_exceptions=True), so callers can degrade per endpoint.
+        
+        Batching is opt-in (metrics_batch_enabled) because the backend does
+        not expose the batch endpoint yet; otherwise, and after the first
+        failed batch call, the summaries come from parallel per-endpoint calls
+        (which also go through request coalescing).
+        """
+        if not endpoints:
+            return {}
+        
+        if get_settings().metrics_batch_enabled and MathMetricRetriever._batch_supported:
+            endpoint = "/math/v1/math/batch"
+            data = {
+                "endpoints": list(endpoints),
+                "date_start": date_start,
+                "date_end": date_end
+            }
+            if timespan:
+                data["timespan"] = timespan
+            
+            logger.info("Calling %s for %s", endpoint, data['endpoints'])
+            try:
+                result = await self.client.post(endpoint, data)
+                # An endpoint the backend left out failed on its side; report it
+                # as failed instead of as an empty, "successful" summary
+                return {
+                    key: result[key] if key in result
+                    else LookupError(f"'{key}' missing from batch response")
+                    for key in endpoints
+                }
+            except httpx.HTTPError as e:
+                logger.warning("Batch call failed (%r), disabling batching and falling back to per-endpoint calls", e)
+                MathMetricRetriever._batch_supported = False
+        
+        return await self._get_unbatched(endpoints, date_start, date_end, timespan)
+    
+    async def _get_unbatched(
+        self,
+        endpoints: List[str],
+        date_start: str,
+        date_end: str,
+        timespan: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Fetch each executive summary with its own request, in parallel."""
+        fetchers = {
+            "ads": self.get_ads_executive_summary,
+            "total": self.get_total_metrics_summary,
+            "cfo": self.get_financial_summary,
+            "organic": self.get_organic_metrics,
+            "attribution": self.get_attribution_metrics,
+            "inventory": self.get_inventory_status,
+        }
+        keys = [key for key in endpoints if key in fetchers]
+        results = await asyncio.gather(
+            *(fetchers[key](date_start, date_end, timespan=timespan) for key in keys),
+            return_exceptions=True
+        )
+        return dict(zip(keys, results))
+
+    
+    # ========== Request coalescing ==========
+    async def _get_coalesced(self, endpoint: str, params: dict, timeout: Optional[float] = None) -> Any:
+        """
+        GET through the per-tenant coalescing cache.
+        
+        The key includes the caller's JWT so results never cross tenants.
+        Failed or cancelled calls are dropped from the cache so the next
+        caller retries instead of receiving the cached error. Every caller
+        gets a freshly decoded copy of the response.
+        """
+        key = (get_jwt_token(), endpoint, tuple(sorted(params.items())))
+        now = time.monotonic()
+        entry = self._coalesced.get(key)
+        if entry is not None and entry[0] > now and entry[1].get_loop() is asyncio.get_running_loop():
+            logger.debug("Coalesced %s %s", endpoint, params)
+            # Shield so one cancelled caller does not cancel the shared call
+            return orjson.loads(await asyncio.shield(entry[1]))
+        
+        if len(self._coalesced) >= _COALESCE_MAX_ENTRIES:
+            for stale_key in [k for k, (expires_at, _) in self._coalesced.items() if expires_at <= now]:
+                del self._coalesced[stale_key]
+            while len(self._coalesced) >= _COALESCE_MAX_ENTRIES:
+                del self._coalesced[next(iter(self._coalesced))]
+        
+        async def _fetch() -> bytes:
+            return orjson.dumps(await self.client.get(endpoint, params, timeout=timeout))
+        
+        task = asyncio.ensure_future(_fetch())
+        
+        def _drop_failed(done: asyncio.Future) -> None:
+            if done.cancelled() or done.exception() is not None:
+                if self._coalesced.get(key, (None, None))[1] is done:
+                    del self._coalesced[key]
+        
+        task.add_done_callback(_drop_failed)
+        self._coalesced[key] = (now + COALESCE_TTL_SECONDS, task)
+        return orjson.loads(await asyncio.shield(task))
+
+
 # ========== Singleton Instance - Use this everywhere ==========
 metrics_api = MathMetricRetriever()
@@ -1,6 +1,6 @@
 # app/models/date_labels.py
 
-from typing import Literal, Optional
+from typing import Literal, Optional, get_args
 from pydantic import BaseModel, Field
 
 
@@ -52,20 +52,23 @@ DateLabelLiteral = Literal[
 ]
 
 
+# Materialized once from the Literal: O(1) membership checks on hot paths
+DATE_LABEL_SET = frozenset(get_args(DateLabelLiteral))
+
+# Day count -> specific predefined label (7 -> "past_7_days")
+PAST_DAYS_LABELS = {
+    int(label.split("_")[1]): label
+    for label in get_args(DateLabelLiteral)
+    if label.startswith("past_") and label != "past_days"
+}
+
+
 # ========== Helper: Get all valid labels as list ==========
 # Useful for prompts, validation, etc.
 
 def get_all_date_labels() -> list[str]:
     """Return all valid date label values as a list."""
-    return [
-        "today", "yesterday", "this_week", "last_week",
-        "this_month", "mtd", "last_month", "this_year", "last_year", "ytd",
-        "past_7_days", "past_14_days", "past_30_days", "past_60_days", "past_90_days", "past_180_days",
-        "past_days",
-        "january", "february", "march", "april", "may", "june",
-        "july", "august", "september", "october", "november", "december",
-        "explicit_date", "default"
-    ]
+    return list(get_args(DateLabelLiteral))
 
 class NormalizedDates(BaseModel):
     """
@@ -1,10 +1,25 @@
 # app/graph/nodes/shared/date_calculator.py
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
 import calendar
-from typing import Tuple
-from app.models.date_labels import DateLabelLiteral
+from functools import lru_cache, partial
+from typing import Optional, Tuple
+from app.models.date_labels import DateLabelLiteral, PAST_DAYS_LABELS
+
+
+# PST/PDT timezone (America/Los_Angeles), built once at import
+_PST_TZ = ZoneInfo("America/Los_Angeles")
+
+# Month labels -> month number, built once at import
+_MONTH_NUMBERS = {
+    "january": 1, "february": 2, "march": 3, "april": 4,
+    "may": 5, "june": 6, "july": 7, "august": 8,
+    "september": 9, "october": 10, "november": 11, "december": 12,
+}
+
+# Month abbreviations indexed by month - 1 (locale-independent, unlike %b)
+_MONTH_ABBRS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
 
 
 class DateCalculator:
@@ -12,8 +27,7 @@ class DateCalculator:
     
     def __init__(self, current_date=None):
         # Use PST/PDT timezone (America/Los_Angeles)
-        pst_tz = ZoneInfo("America/Los_Angeles")
-        self.current_date = current_date or datetime.now(pst_tz).date()
+        self.current_date = current_date or datetime.now(_PST_TZ).date()
     
     def calculate(
         self,
@@ -46,72 +60,53 @@ class DateCalculator:
         if label == "past_days":
             if not custom_days or custom_days <= 0:
                 raise ValueError("Label 'past_days' requires custom_days_count parameter (must be > 0)")
-            return self._past_x_days(custom_days)
+            return _calculate_for_day(self.current_date, label, custom_days)
         
-        # Mapping for all other labels
-        label_map = {
-            # Relative dates
-            "today": self._today,
-            "yesterday": self._yesterday,
-            "this_week": self._this_week,
-            "last_week": self._last_week,
-            "this_month": self._this_month,
-            "mtd": self._mtd,
-            "last_month": self._last_month,
-            "this_year": self._this_year,
-            "last_year": self._last_year,
-            "ytd": self._ytd,
-            
-            # Past X days - SPECIFIC values
-            "past_7_days": lambda: self._past_x_days(7),
-            "past_14_days": lambda: self._past_x_days(14),
-            "past_30_days": lambda: self._past_x_days(30),
-            "past_60_days": lambda: self._past_x_days(60),
-            "past_90_days": lambda: self._past_x_days(90),
-            "past_180_days": lambda: self._past_x_days(180),
-
-            # Months
-            "january": lambda: self._month_range(1),
-            "february": lambda: self._month_range(2),
-            "march": lambda: self._month_range(3),
-            "april": lambda: self._month_range(4),
-            "may": lambda: self._month_range(5),
-            "june": lambda: self._month_range(6),
-            "july": lambda: self._month_range(7),
-            "august": lambda: self._month_range(8),
-            "september": lambda: self._month_range(9),
-            "october": lambda: self._month_range(10),
-            "november": lambda: self._month_range(11),
-            "december": lambda: self._month_range(12),
-            
-            
-            # Default
-            "default": lambda: self._past_x_days(7),
-        }
+        # Every other label (relative, past X days, months, default)
+        return _calculate_for_day(self.current_date, label, None)
+    
+    def calculate_range(
+        self,
+        start_label: DateLabelLiteral,
+        end_label: DateLabelLiteral,
+        explicit_start: str = None,
+        explicit_end: str = None,
+        custom_days: int = None
+    ) -> Tuple[str, str]:
+        """
+        Convert a start/end label pair to a single (date_start, date_end) range.
+        
+        date_start comes from start_label's range and date_end from end_label's.
+        When both labels are the same (the usual single-period case) the range
+        is computed once instead of twice.
         
-        if label not in label_map:
-            # This should never happen due to Literal typing, but safeguard anyway
-            raise ValueError(f"Unknown date label: {label}")
+        Raises:
+            ValueError: Same conditions as calculate()
+        """
+        if start_label == end_label and start_label != "explicit_date":
+            return self.calculate(start_label, custom_days=custom_days)
         
-        return label_map[label]()
+        start_date, _ = self.calculate(start_label, explicit_date=explicit_start, custom_days=custom_days)
+        _, end_date = self.calculate(end_label, explicit_date=explicit_end, custom_days=custom_days)
+        return (start_date, end_date)
     
     # ========== Calculation Methods ==========
     # (Same as before - keeping them here for completeness)
     
     def _today(self) -> Tuple[str, str]:
-        date_str = self.current_date.strftime("%Y-%m-%d")
+        date_str = self.current_date.isoformat()
         return (date_str, date_str)
     
     def _yesterday(self) -> Tuple[str, str]:
         yesterday = self.current_date - timedelta(days=1)
-        date_str = yesterday.strftime("%Y-%m-%d")
+        date_str = yesterday.isoformat()
         return (date_str, date_str)
     
     def _past_x_days(self, days: int) -> Tuple[str, str]:
         start_date = self.current_date - timedelta(days=days - 1)
         return (
-            start_date.strftime("%Y-%m-%d"),
-            self.current_date.strftime("%Y-%m-%d")
+            start_date.isoformat(),
+            self.current_date.isoformat()
         )
     
     def _this_week(self) -> Tuple[str, str]:
@@ -120,8 +115,8 @@ class DateCalculator:
         monday = self.current_date - timedelta(days=weekday)
         sunday = monday + timedelta(days=6)
         return (
-            monday.strftime("%Y-%m-%d"),
-            sunday.strftime("%Y-%m-%d")
+            monday.isoformat(),
+            sunday.isoformat()
         )
     
     def _last_week(self) -> Tuple[str, str]:
@@ -129,8 +124,8 @@ class DateCalculator:
         last_monday = self.current_date - timedelta(days=weekday + 7)
         last_sunday = last_monday + timedelta(days=6)
         return (
-            last_monday.strftime("%Y-%m-%d"),
-            last_sunday.strftime("%Y-%m-%d")
+            last_monday.isoformat(),
+            last_sunday.isoformat()
         )
     
     def _this_month(self) -> Tuple[str, str]:
@@ -139,16 +134,16 @@ class DateCalculator:
         last_day = calendar.monthrange(self.current_date.year, self.current_date.month)[1]
         last_day_date = self.current_date.replace(day=last_day)
         return (
-            first_day.strftime("%Y-%m-%d"),
-            last_day_date.strftime("%Y-%m-%d")
+            first_day.isoformat(),
+            last_day_date.isoformat()
         )
     
     def _mtd(self) -> Tuple[str, str]:
         """Month-to-Date: First day of current month to today"""
         first_day = self.current_date.replace(day=1)
         return (
-            first_day.strftime("%Y-%m-%d"),
-            self.current_date.strftime("%Y-%m-%d")
+            first_day.isoformat(),
+            self.current_date.isoformat()
         )
     
     def _last_month(self) -> Tuple[str, str]:
@@ -156,15 +151,15 @@ class DateCalculator:
         last_day_last_month = first_this_month - timedelta(days=1)
         first_last_month = last_day_last_month.replace(day=1)
         return (
-            first_last_month.strftime("%Y-%m-%d"),
-            last_day_last_month.strftime("%Y-%m-%d")
+            first_last_month.isoformat(),
+            last_day_last_month.isoformat()
         )
     
     def _this_year(self) -> Tuple[str, str]:
         jan_1 = self.current_date.replace(month=1, day=1)
         return (
-            jan_1.strftime("%Y-%m-%d"),
-            self.current_date.strftime("%Y-%m-%d")
+            jan_1.isoformat(),
+            self.current_date.isoformat()
         )
     
     def _last_year(self) -> Tuple[str, str]:
@@ -200,4 +195,88 @@ class DateCalculator:
             f"{year}-{month:02d}-01",
             f"{year}-{month:02d}-{last_day:02d}"
         )
-    
\ No newline at end of file
+
+
+# Label -> unbound calculation taking the calculator, built once at import
+# instead of a fresh dict of bound methods and lambdas on every calculate()
+_LABEL_DISPATCH = {
+    # Relative dates
+    "today": DateCalculator._today,
+    "yesterday": DateCalculator._yesterday,
+    "this_week": DateCalculator._this_week,
+    "last_week": DateCalculator._last_week,
+    "this_month": DateCalculator._this_month,
+    "mtd": DateCalculator._mtd,
+    "last_month": DateCalculator._last_month,
+    "this_year": DateCalculator._this_year,
+    "last_year": DateCalculator._last_year,
+    "ytd": DateCalculator._ytd,
+    
+    # Past X days - SPECIFIC values
+    **{label: partial(DateCalculator._past_x_days, days=days) for days, label in PAST_DAYS_LABELS.items()},
+    
+    # Months
+    **{label: partial(DateCalculator._month_range, month=month) for label, month in _MONTH_NUMBERS.items()},
+    
+    # Default
+    "default": partial(DateCalculator._past_x_days, days=7),
+}
+
+
+# Process-wide calculator for the current PST day (see get_calculator)
+_calculator: Optional[DateCalculator] = None
+
+
+def get_calculator() -> DateCalculator:
+    """Shared DateCalculator for today (PST), replaced when the day rolls over."""
+    global _calculator
+    today = datetime.now(_PST_TZ).date()
+    if _calculator is None or _calculator.current_date != today:
+        _calculator = DateCalculator(today)
+    return _calculator
+
+
+@lru_cache(maxsize=4096)
+def _calculate_for_day(current_date: date, label: str, custom_days: int = None) -> Tuple[str, str]:
+    """
+    Memoized label -> (date_start, date_end) for a given day.
+    
+    The range depends only on (today, label, custom_days), so concurrent
+    requests on the same day share results; a new day is a new cache key.
+    """
+    calculator = DateCalculator(current_date)
+    if label == "past_days":
+        return calculator._past_x_days(custom_days)
+    
+    calculation = _LABEL_DISPATCH.get(label)
+    if calculation is None:
+        # This should never happen due to Literal typing, but safeguard anyway
+        raise ValueError(f"Unknown date label: {label}")
+    
+    return calculation(calculator)
+
+
+def format_date_range(start_str: str, end_str: str) -> str:
+    """
+    Format an ISO date range for display.
+    - Same month: "Sep 1-14, 2025"
+    - Different months: "Sep 1 - Oct 14, 2025"
+    - Single day: "Sep 1, 2025"
+    """
+    start = date.fromisoformat(start_str)
+    end = date.fromisoformat(end_str)
+    start_month = _MONTH_ABBRS[start.month - 1]
+    end_month = _MONTH_ABBRS[end.month - 1]
+    
+    if start == end:
+        # Single day: "Sep 1, 2025"
+        return f"{start_month} {start.day}, {start.year}"
+    elif start.month == end.month and start.year == end.year:
+        # Same month: "Sep 1-14, 2025"
+        return f"{start_month} {start.day}-{end.day}, {start.year}"
+    elif start.year == end.year:
+        # Different months, same year: "Sep 1 - Oct 14, 2025"
+        return f"{start_month} {start.day} - {end_month} {end.day}, {start.year}"
+    else:
+        # Different years: "Dec 15, 2024 - Jan 14, 2025"
+        return f"{start_month} {start.day}, {start.year} - {end_month} {end.day}, {end.year}"
@@ -0,0 +1,31 @@
+"""
+Shared LLM clients.
+
+Nodes build their chat clients through get_chat_llm so every node reuses one
+ChatOpenAI (and its HTTP connection pool) per model/temperature instead of
+constructing a new client on each request.
+
+Usage:
+    from app.utils.llm import get_chat_llm
+
+    llm = get_chat_llm(settings.openai_model)
+    response = await llm.ainvoke(prompt)
+"""
+
+from functools import lru_cache
+
+from langchain_openai import ChatOpenAI
+
+from app.config import get_settings
+
+
+@lru_cache(maxsize=8)
+def get_chat_llm(model: str, temperature: float = 0) -> ChatOpenAI:
+    """Build (once per model/temperature) a shared streaming ChatOpenAI client."""
+    settings = get_settings()
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        api_key=settings.openai_api_key,
+        streaming=True
+    )
@@ -0,0 +1,56 @@
+"""
+Metrics Payload - Locate the metrics dict inside a Nyle backend response.
+
+Executive-summary endpoints wrap their metrics in a few different shapes;
+this is the one place that knows them, shared by the metric tools and the
+insight handler.
+
+Usage:
+    from app.utils.metrics_payload import locate_metrics_payload
+    
+    acos = locate_metrics_payload(response).get("acos")
+"""
+
+from typing import Any, Dict
+
+
+def locate_metrics_payload(response_data: Any) -> Dict[str, Any]:
+    """
+    Find the dict holding the metrics inside an API response.
+    Handles multiple response formats:
+    - {"data": [{"value": {...metrics...}}]} (timespan=day format)
+    - [{"metric": value}] (plain list)
+    - {"data": {...metrics...}} (nested dict)
+    - {"metric": value} (flat dict)
+    """
+    # Handle list response directly
+    if isinstance(response_data, list):
+        if len(response_data) > 0 and isinstance(response_data[0], dict):
+            first_item = response_data[0]
+            # Check if metrics are in 'value' key
+            if 'value' in first_item and isinstance(first_item['value'], dict):
+                return first_item['value']
+            return first_item
+        return {}
+    
+    # Handle dict response
+    if isinstance(response_data, dict):
+        # Check if 'data' is a list (timespan=day format: {"data": [{"value": {...}}]})
+        if 'data' in response_data and isinstance(response_data['data'], list):
+            data_list = response_data['data']
+            if len(data_list) > 0 and isinstance(data_list[0], dict):
+                first_item = data_list[0]
+                # Check if metrics are in 'value' key
+                if 'value' in first_item and isinstance(first_item['value'], dict):
+                    return first_item['value']
+                return first_item
+            return {}
+        
+        # Check if 'data' is a dict
+        if 'data' in response_data and isinstance(response_data['data'], dict):
+            return response_data['data']
+        
+        # Metrics at top level
+        return response_data
+    
+    return {}
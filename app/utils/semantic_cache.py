@@ -0,0 +1,138 @@
+"""
+Semantic Cache - In-process embedding-similarity cache for LLM results.
+
+Questions are embedded with OpenAI embeddings; a lookup returns the cached
+value of the most similar stored question if cosine similarity clears the
+cache's threshold. Entries are partitioned by an exact-match `scope` (e.g. a
+hash of the data the LLM saw), so a hit can only come from the same scope.
+
+Disabled unless `semantic_cache_enabled` is set; when disabled (or when the
+embedding call fails) `embed()` returns None and lookups/stores are no-ops.
+
+Usage:
+    from app.utils.semantic_cache import SemanticCache
+    
+    _CACHE = SemanticCache("insight_intent", threshold=0.95)
+    
+    embedding = _CACHE.embed(question)
+    cached = _CACHE.lookup(embedding)
+    if cached is None:
+        cached = call_llm(question)
+        _CACHE.store(embedding, cached)
+"""
+
+import hashlib
+import logging
+import math
+import operator
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, List, Optional
+
+from langchain_openai import OpenAIEmbeddings
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4)
+def _get_embeddings(model: str) -> OpenAIEmbeddings:
+    """Build (once per model) the embeddings client shared by every cache."""
+    settings = get_settings()
+    return OpenAIEmbeddings(model=model, api_key=settings.openai_api_key)
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    """Scale to unit length so a dot product is the cosine similarity."""
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+def scope_key(*parts: Any) -> str:
+    """Stable short hash of the values that must match exactly for a hit."""
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+
+
+class SemanticCache:
+    """
+    Bounded, TTL'd, in-process semantic cache.
+    
+    Least recently used entries are evicted once `max_entries` is reached.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        threshold: float,
+        max_entries: int = 256,
+        ttl_seconds: float = 24 * 3600
+    ):
+        self.name = name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # id -> (scope, unit vector, value, expires_at)
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._next_id = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return get_settings().semantic_cache_enabled
+    
+    def embed(self, text: str) -> Optional[List[float]]:
+        """Embed text for lookup/store; None when disabled or on failure."""
+        if not self.enabled:
+            return None
+        settings = get_settings()
+        try:
+            return _normalize(_get_embeddings(settings.embedding_model).embed_query(text))
+        except Exception as e:
+            logger.warning("Semantic cache '%s': embedding failed: %s", self.name, e)
+            return None
+    
+    async def aembed(self, text: str) -> Optional[List[float]]:
+        """Async variant of embed()."""
+        if not self.enabled:
+            return None
+        settings = get_settings()
+        try:
+            return _normalize(await _get_embeddings(settings.embedding_model).aembed_query(text))
+        except Exception as e:
+            logger.warning("Semantic cache '%s': embedding failed: %s", self.name, e)
+            return None
+    
+    def lookup(self, embedding: Optional[List[float]], scope: str = "") -> Optional[Any]:
+        """Return the cached value of the closest entry in scope, if similar enough."""
+        if embedding is None:
+            return None
+        
+        now = time.monotonic()
+        best_id, best_score = None, self.threshold
+        for entry_id, (entry_scope, vector, _, expires_at) in list(self._entries.items()):
+            if expires_at <= now:
+                del self._entries[entry_id]
+                continue
+            if entry_scope != scope:
+                continue
+            score = sum(map(operator.mul, embedding, vector))
+            if score >= best_score:
+                best_id, best_score = entry_id, score
+        
+        if best_id is None:
+            return None
+        
+        self._entries.move_to_end(best_id)
+        logger.info("Semantic cache '%s' hit (similarity %.3f)", self.name, best_score)
+        return self._entries[best_id][2]
+    
+    def store(self, embedding: Optional[List[float]], value: Any, scope: str = "") -> None:
+        """Cache value under the given embedding and scope."""
+        if embedding is None:
+            return
+        
+        self._entries[self._next_id] = (scope, embedding, value, time.monotonic() + self.ttl_seconds)
+        self._next_id += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
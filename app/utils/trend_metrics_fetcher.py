@@ -182,19 +182,20 @@ def _calculate_stats(days: list) -> dict:
     if not days:
         return {}
     
+    # days is non-empty here, so no per-metric emptiness guards are needed
+    count = len(days)
     profit_vals = [d["profit"] for d in days]
-    acos_vals = [d["acos"] for d in days]
-    ad_tos_is_vals = [d["ad_tos_is"] for d in days]
+    profit_sum = sum(profit_vals)
     
     return {
         "profit": {
-            "sum": sum(profit_vals),
-            "avg": sum(profit_vals) // len(profit_vals) if profit_vals else 0,
-            "max": max(profit_vals) if profit_vals else 0,
-            "min": min(profit_vals) if profit_vals else 0
+            "sum": profit_sum,
+            "avg": profit_sum // count,
+            "max": max(profit_vals),
+            "min": min(profit_vals)
         },
-        "acos_avg": round(sum(acos_vals) / len(acos_vals), 2) if acos_vals else 0,
-        "ad_tos_is_avg": round(sum(ad_tos_is_vals) / len(ad_tos_is_vals), 2) if ad_tos_is_vals else 0
+        "acos_avg": round(sum(d["acos"] for d in days) / count, 2),
+        "ad_tos_is_avg": round(sum(d["ad_tos_is"] for d in days) / count, 2)
     }
 
 
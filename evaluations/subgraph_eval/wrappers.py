@@ -100,17 +100,17 @@ def example_to_subgraph_state(inputs: Dict[str, Any]) -> SubgraphState:
     }
 
 
-def node1_wrapped(state: SubgraphState) -> SubgraphState:
+async def node1_wrapped(state: SubgraphState) -> SubgraphState:
     """
     Wrapper for label_normalizer_node.
     
     Runs the actual node and returns updated state.
     """
-    result = label_normalizer_node(state)
+    result = await label_normalizer_node(state)
     return result
 
 
-def node2_wrapped(state: SubgraphState) -> SubgraphState:
+async def node2_wrapped(state: SubgraphState) -> SubgraphState:
     """
     Wrapper for message_analyzer_node with test date injection.
     
@@ -134,9 +134,9 @@ def node2_wrapped(state: SubgraphState) -> SubgraphState:
             pst_tz = ZoneInfo("America/Los_Angeles")
             mock_dt.now.return_value = datetime.combine(mock_date, datetime.min.time()).replace(tzinfo=pst_tz)
             
-            result = message_analyzer_node(state)
+            result = await message_analyzer_node(state)
     else:
-        result = message_analyzer_node(state)
+        result = await message_analyzer_node(state)
     
     return result
 
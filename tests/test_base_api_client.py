@@ -0,0 +1,67 @@
+"""
+Tests for the shared HTTP client in BaseAPIClient.
+
+Requests go to an httpx.MockTransport, so these run offline.
+"""
+
+import asyncio
+import importlib
+import os
+import sys
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.metricsAccessLayer.BaseAPIClient import BaseAPIClient, close_shared_client
+from app.context import set_jwt_token_for_task
+
+# The package re-exports the class under the module's name
+base_module = importlib.import_module("app.metricsAccessLayer.BaseAPIClient")
+
+
+def _mock_async_client(monkeypatch, handler):
+    """Make get_shared_client build clients that answer through handler."""
+    real_async_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        base_module.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_async_client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+
+
+def test_client_and_limiters_follow_the_running_loop(monkeypatch):
+    _mock_async_client(monkeypatch, lambda request: httpx.Response(200, json={"path": request.url.path}))
+    seen = []
+    
+    async def call():
+        set_jwt_token_for_task("test-jwt")
+        result = await BaseAPIClient().get("/math/v1/math/ads/executive-summary")
+        seen.append((base_module.get_shared_client(), base_module._endpoint_semaphore("/math/v1/math/ads/executive-summary")))
+        return result
+    
+    # Each asyncio.run is a new loop; the second must not reuse the first's client
+    assert asyncio.run(call()) == {"path": "/math/v1/math/ads/executive-summary"}
+    assert asyncio.run(call()) == {"path": "/math/v1/math/ads/executive-summary"}
+    
+    (client_a, semaphore_a), (client_b, semaphore_b) = seen
+    assert client_a is not client_b
+    assert semaphore_a is not semaphore_b
+    # The first loop is closed, so its entries are gone
+    assert len(base_module._shared_clients) == 1
+    assert len(base_module._endpoint_semaphores) == 1
+
+
+def test_close_shared_client_resets_the_loop_entry(monkeypatch):
+    _mock_async_client(monkeypatch, lambda request: httpx.Response(200, json={}))
+    
+    async def open_then_close():
+        set_jwt_token_for_task("test-jwt")
+        await BaseAPIClient().post("/math/v1/math/batch", {})
+        client = base_module.get_shared_client()
+        await close_shared_client()
+        assert client.is_closed
+        assert asyncio.get_running_loop() not in base_module._shared_clients
+        assert asyncio.get_running_loop() not in base_module._endpoint_semaphores
+    
+    asyncio.run(open_then_close())
@@ -0,0 +1,120 @@
+"""
+Tests for the insight query handler's deterministic paths.
+
+Pure functions only: no backend or LLM calls.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.graph.nodes.classifier_route_node.insight_query_handler.node import (
+    _deterministic_comparison,
+    _match_insight_intent
+)
+
+
+def _comparison_data(earlier: dict, recent: dict) -> dict:
+    """Comparison pipeline output: August (earlier) vs September (recent)."""
+    return {
+        "period_a_start": "2025-09-01",
+        "period_a_end": "2025-09-30",
+        "period_b_start": "2025-08-01",
+        "period_b_end": "2025-08-31",
+        "current": recent,
+        "comparison": earlier,
+    }
+
+
+@pytest.mark.parametrize("question, earlier, recent, expected", [
+    (
+        "Compare ad spend August vs September",
+        {"ad_spend": 1750000.0},
+        {"ad_spend": 1935035.0},
+        "**Aug 1-31, 2025:** $1,750,000.00\n"
+        "**Sep 1-30, 2025:** $1,935,035.00\n"
+        "**Change:** +$185,035.00 (+10.6% increase)"
+    ),
+    (
+        "Compare acos August vs September",
+        {"acos": 0.2656},
+        {"acos": 0.2173},
+        "**Aug 1-31, 2025:** 26.56%\n"
+        "**Sep 1-30, 2025:** 21.73%\n"
+        "**Change:** -4.83 pts (-18.2% decrease)"
+    ),
+    (
+        "Compare roas August vs September",
+        {"roas": 3.5},
+        {"roas": 4.2},
+        "**Aug 1-31, 2025:** 3.50\n"
+        "**Sep 1-30, 2025:** 4.20\n"
+        "**Change:** +0.70 (+20.0% increase)"
+    ),
+    (
+        "Compare ad orders August vs September",
+        {"ad_orders": 1200},
+        {"ad_orders": 1200},
+        "**Aug 1-31, 2025:** 1,200\n"
+        "**Sep 1-30, 2025:** 1,200\n"
+        "**Change:** No change"
+    ),
+])
+def test_deterministic_comparison_formats(question, earlier, recent, expected):
+    assert _deterministic_comparison(_comparison_data(earlier, recent), question) == expected
+
+
+def test_deterministic_comparison_reads_nested_payload():
+    data = _comparison_data(
+        {"data": [{"value": {"ad_tos_is": 0.04}}]},
+        {"data": [{"value": {"ad_tos_is": 0.05}}]}
+    )
+    
+    assert _deterministic_comparison(data, "How did my Ad TOS IS change from Aug to Sep").endswith(
+        "**Change:** +1.00 pts (+25.0% increase)"
+    )
+
+
+@pytest.mark.parametrize("question, earlier, recent", [
+    # Asks for reasons
+    ("Why did my acos change from August to September", {"acos": 0.2}, {"acos": 0.3}),
+    # No supported metric
+    ("Compare August vs September", {"acos": 0.2}, {"acos": 0.3}),
+    # Bare word that may mean totals
+    ("Compare total orders August vs September", {"ad_orders": 1}, {"ad_orders": 2}),
+    # Two metrics
+    ("Compare acos and roas August vs September", {"acos": 0.2, "roas": 3.0}, {"acos": 0.3, "roas": 4.0}),
+    # Non-numeric or missing values
+    ("Compare acos August vs September", {"acos": "n/a"}, {"acos": 0.3}),
+    ("Compare acos August vs September", {"acos": True}, {"acos": 0.3}),
+    ("Compare acos August vs September", {}, {"acos": 0.3}),
+])
+def test_deterministic_comparison_falls_through_to_llm(question, earlier, recent):
+    assert _deterministic_comparison(_comparison_data(earlier, recent), question) is None
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("What was my net profit losses over Oct 15 - Oct 30?", "net_profit_loss"),
+    ("How much did I lose on ads?", "net_profit_loss"),
+    ("What's my non-optimal spend?", "net_profit_loss"),
+    ("How much money was wasted last week?", "net_profit_loss"),
+    ("Compare sales performance in August vs September", "comparison"),
+    ("This month versus last month", "comparison"),
+    ("What changed from last week to this week", "comparison"),
+    ("Show me trends for last month", "trend_analysis"),
+    ("Show net profit trend", "trend_analysis"),
+    ("How did my metrics change day by day last month", "trend_analysis"),
+    ("What happened in October?", "trend_analysis"),
+    # Left to the LLM
+    ("Why did my net profit drop last week", None),
+    ("Why is my acos higher than last month vs September", None),
+    ("What is my net profit?", None),
+    ("Give me insights from Oct 1 to Oct 30", None),
+    ("Daily acos vs last month", "comparison"),
+    ("Show profit loss trend vs last month", None),
+])
+def test_match_insight_intent(question, expected):
+    assert _match_insight_intent(question) == expected
@@ -0,0 +1,361 @@
+"""
+Tests for the label normalizer: ASIN handling, the regex fast path, the
+exact-match and SQLite caches, the micro-batcher and the validation retry.
+
+The LLM is replaced by a stub that records the prompt it receives, so these
+run offline.
+"""
+
+import asyncio
+import os
+import sys
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.graph.nodes.label_normalizer import node as label_normalizer
+from app.graph.nodes.label_normalizer import cache as label_cache
+
+LabelExtraction = label_normalizer.LabelExtraction
+
+
+class _RecordingLLM:
+    """Stands in for the structured-output client and records each prompt."""
+    
+    def __init__(self, extraction):
+        self.extraction = extraction
+        self.prompts = []
+    
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt)
+        return self.extraction.model_copy()
+
+
+def _run_with_stub(monkeypatch, question, extraction):
+    llm = _RecordingLLM(extraction)
+    monkeypatch.setattr(label_normalizer, "_get_extraction_llm", lambda model: llm)
+    label_normalizer._extraction_cache.clear()
+    state = asyncio.run(label_normalizer.label_normalizer_node({"question": question}))
+    return state, llm.prompts
+
+
+def test_glued_date_phrase_is_not_an_asin(monkeypatch):
+    question = "show sales for the last30days vs previous30days"
+    extraction = label_normalizer.LabelExtraction(
+        date_start_label="past_30_days",
+        date_end_label="past_30_days",
+        compare_date_start_label="past_30_days",
+        compare_date_end_label="past_30_days"
+    )
+    
+    state, prompts = _run_with_stub(monkeypatch, question, extraction)
+    
+    assert state["asin"] is None
+    assert len(prompts) == 1
+    assert "last30days vs previous30days" in prompts[0]
+
+
+def test_b0_asin_is_masked_and_taken_from_regex(monkeypatch):
+    question = "sales for b0abc12345 last30days vs previous30days"
+    extraction = label_normalizer.LabelExtraction(
+        date_start_label="past_30_days",
+        date_end_label="past_30_days",
+        asin="B0WRONG000"
+    )
+    
+    state, prompts = _run_with_stub(monkeypatch, question, extraction)
+    
+    assert state["asin"] == "B0ABC12345"
+    assert "sales for ASIN last30days vs previous30days" in prompts[0]
+    assert "b0abc12345" not in prompts[0].lower()
+
+
+# ========== Fast path ==========
+
+TODAY = date(2025, 10, 16)
+
+
+@pytest.mark.parametrize("question, label, days, asin, explicit", [
+    ("B0ABC12345 sales last week", "last_week", None, "B0ABC12345", None),
+    ("acos yesterday", "yesterday", None, None, None),
+    ("Sales   MONTH TO DATE", "mtd", None, None, None),
+    ("acos past 23 days", "past_days", 23, None, None),
+    ("sales 2025-03-01 to 2025-03-07", "explicit_date", None, None, ("2025-03-01", "2025-03-07")),
+    ("december sales", "december", None, None, None),
+])
+def test_fast_path_labels_simple_questions(question, label, days, asin, explicit):
+    extraction = label_normalizer._try_fast_extraction(question, TODAY)
+    
+    assert extraction.date_start_label == extraction.date_end_label == label
+    assert extraction.custom_days_count == days
+    assert extraction.asin == asin
+    assert (extraction.explicit_date_start, extraction.explicit_date_end) == (explicit or (None, None))
+    assert extraction.compare_date_start_label is None
+
+
+@pytest.mark.parametrize("question", [
+    "sales last week vs previous week",
+    "sales for dec 3",
+    "show me sales",
+    "B0AAAAAAAA and B0BBBBBBBB yesterday",
+    "sales 2025-03-07 to 2025-03-01",
+    "sales 2025-11-01",
+    "acos may 2025",
+])
+def test_fast_path_defers_to_llm(question):
+    assert label_normalizer._try_fast_extraction(question, TODAY) is None
+
+
+def test_fast_path_skips_the_llm_and_the_exact_cache(monkeypatch):
+    def no_llm(model):
+        raise AssertionError("fast path must not build the LLM")
+    monkeypatch.setattr(label_normalizer, "_get_extraction_llm", no_llm)
+    label_normalizer._extraction_cache.clear()
+    
+    state = asyncio.run(label_normalizer.label_normalizer_node({"question": "acos yesterday"}))
+    
+    assert state["_date_start_label"] == "yesterday"
+    assert not label_normalizer._extraction_cache
+
+
+# ========== Exact-match cache ==========
+
+class _ScriptedLLM:
+    """Answers with the given extractions in order; records (model, prompt)."""
+    
+    def __init__(self, *extractions):
+        self.extractions = list(extractions)
+        self.calls = []
+    
+    def bind(self, model):
+        self.model = model
+        return self
+    
+    async def ainvoke(self, prompt):
+        self.calls.append((self.model, prompt))
+        return self.extractions.pop(0).model_copy()
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Scripted LLM behind node settings with batching and the SQLite tier off."""
+    stub = _ScriptedLLM()
+    settings = SimpleNamespace(
+        label_normalizer_model="label-model",
+        openai_model="main-model",
+        label_batch_window_ms=0,
+        label_cache_path=""
+    )
+    monkeypatch.setattr(label_normalizer, "get_settings", lambda: settings)
+    monkeypatch.setattr(label_cache, "get_settings", lambda: settings)
+    monkeypatch.setattr(label_normalizer, "_get_extraction_llm", stub.bind)
+    monkeypatch.setattr(label_normalizer, "_persistent_cache", label_cache.LabelCache())
+    label_normalizer._extraction_cache.clear()
+    stub.settings = settings
+    return stub
+
+
+def _normalize(question):
+    return asyncio.run(label_normalizer.label_normalizer_node({"question": question}))
+
+
+PAST_30_VS_PREVIOUS = LabelExtraction(
+    date_start_label="past_30_days",
+    date_end_label="past_30_days",
+    compare_date_start_label="past_30_days",
+    compare_date_end_label="past_30_days"
+)
+
+
+def test_exact_cache_reuses_extraction_across_whitespace_and_asins(llm):
+    llm.extractions = [PAST_30_VS_PREVIOUS]
+    
+    first = _normalize("sales for B0AAAAAAAA last 30 days vs previous 30 days")
+    second = _normalize("sales  for B0BBBBBBBB last 30 days vs previous 30 days ")
+    
+    assert len(llm.calls) == 1
+    assert first["asin"] == "B0AAAAAAAA"
+    assert second["asin"] == "B0BBBBBBBB"
+    assert second["_compare_date_start_label"] == "past_30_days"
+
+
+def test_exact_cache_misses_on_a_different_question(llm):
+    llm.extractions = [PAST_30_VS_PREVIOUS, PAST_30_VS_PREVIOUS]
+    
+    _normalize("sales last 30 days vs previous 30 days")
+    _normalize("acos last 30 days vs previous 30 days")
+    
+    assert len(llm.calls) == 2
+
+
+def test_persistent_cache_serves_after_in_process_cache_is_cleared(llm, tmp_path):
+    llm.settings.label_cache_path = str(tmp_path / "labels.sqlite")
+    llm.extractions = [PAST_30_VS_PREVIOUS]
+    
+    _normalize("sales last 30 days vs previous 30 days")
+    label_normalizer._extraction_cache.clear()
+    state = _normalize("sales last 30 days vs previous 30 days")
+    
+    assert len(llm.calls) == 1
+    assert state["_date_start_label"] == "past_30_days"
+    assert label_normalizer._persistent_cache.hits == 1
+
+
+# ========== SQLite LabelCache ==========
+
+@pytest.fixture
+def sqlite_settings(monkeypatch, tmp_path):
+    settings = SimpleNamespace(label_cache_path=str(tmp_path / "labels.sqlite"))
+    monkeypatch.setattr(label_cache, "get_settings", lambda: settings)
+    return settings
+
+
+def test_label_cache_round_trip(sqlite_settings):
+    cache = label_cache.LabelCache()
+    key = ("sales last 30 days", "2025-10-16")
+    
+    assert cache.get(key) is None
+    cache.set(key, '{"date_start_label": "past_30_days"}')
+    
+    assert cache.get(key) == '{"date_start_label": "past_30_days"}'
+    assert cache.get(("sales last 30 days", "2025-10-17")) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_label_cache_is_shared_through_the_file(sqlite_settings):
+    key = ("sales last 30 days", "2025-10-16")
+    label_cache.LabelCache().set(key, "{}")
+    
+    # A second connection, as another worker process would open
+    assert label_cache.LabelCache().get(key) == "{}"
+
+
+def test_label_cache_expires_entries(sqlite_settings):
+    cache = label_cache.LabelCache(ttl_seconds=0)
+    cache.set(("q", "d"), "{}")
+    
+    assert cache.get(("q", "d")) is None
+
+
+def test_label_cache_is_disabled_without_a_path(sqlite_settings):
+    sqlite_settings.label_cache_path = ""
+    cache = label_cache.LabelCache()
+    cache.set(("q", "d"), "{}")
+    
+    assert cache.get(("q", "d")) is None
+    assert cache._conn is None
+
+
+# ========== Micro-batcher ==========
+
+class _BatchLLM:
+    """Batch structured-output stub: returns `extractions` for the numbered prompt."""
+    
+    def __init__(self, extractions):
+        self.extractions = extractions
+        self.prompts = []
+    
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt)
+        return label_normalizer.LabelExtractionBatch(extractions=self.extractions)
+
+
+def _extract_concurrently(questions):
+    batcher = label_normalizer._LabelExtractionBatcher()
+    
+    async def run():
+        return await asyncio.gather(
+            *(batcher.extract(q, "label-model", 2025, 0.01) for q in questions),
+            return_exceptions=True
+        )
+    return asyncio.run(run())
+
+
+def _labelled(label):
+    return LabelExtraction(date_start_label=label, date_end_label=label)
+
+
+def test_batcher_shares_one_call_for_concurrent_questions(monkeypatch):
+    batch_llm = _BatchLLM([_labelled("yesterday"), _labelled("last_week")])
+    single_llm = _ScriptedLLM()
+    monkeypatch.setattr(label_normalizer, "_get_batch_extraction_llm", lambda model: batch_llm)
+    monkeypatch.setattr(label_normalizer, "_get_extraction_llm", single_llm.bind)
+    
+    results = _extract_concurrently(["sales 1 day ago", "sales 1 week ago"])
+    
+    assert [r.date_start_label for r in results] == ["yesterday", "last_week"]
+    assert len(batch_llm.prompts) == 1
+    assert "1. sales 1 day ago\n2. sales 1 week ago" in batch_llm.prompts[0]
+    assert single_llm.calls == []
+
+
+def test_batcher_falls_back_to_single_calls_on_count_mismatch(monkeypatch):
+    batch_llm = _BatchLLM([_labelled("yesterday")])
+    single_llm = _ScriptedLLM(_labelled("yesterday"), _labelled("last_week"))
+    monkeypatch.setattr(label_normalizer, "_get_batch_extraction_llm", lambda model: batch_llm)
+    monkeypatch.setattr(label_normalizer, "_get_extraction_llm", single_llm.bind)
+    
+    results = _extract_concurrently(["sales 1 day ago", "sales 1 week ago"])
+    
+    assert [r.date_start_label for r in results] == ["yesterday", "last_week"]
+    assert len(single_llm.calls) == 2
+
+
+def test_batcher_sends_a_lone_question_as_a_single_call(monkeypatch):
+    single_llm = _ScriptedLLM(_labelled("yesterday"))
+    monkeypatch.setattr(label_normalizer, "_get_batch_extraction_llm", lambda model: pytest.fail("no batch call"))
+    monkeypatch.setattr(label_normalizer, "_get_extraction_llm", single_llm.bind)
+    
+    (result,) = _extract_concurrently(["sales 1 day ago"])
+    
+    assert result.date_start_label == "yesterday"
+    assert single_llm.calls[0][0] == "label-model"
+
+
+# ========== Validation retry ==========
+
+@pytest.mark.parametrize("extraction, problem", [
+    (_labelled("last_week"), None),
+    (LabelExtraction(date_start_label="last_week", date_end_label="last_week",
+                     compare_date_start_label="last_month"), "compare_date_start_label and compare_date_end_label"),
+    (LabelExtraction(date_start_label="explicit_date", date_end_label="explicit_date",
+                     explicit_date_start="2025-13-01", explicit_date_end="2025-12-01"), "date_start_label is 'explicit_date'"),
+    (LabelExtraction(date_start_label="explicit_date", date_end_label="explicit_date",
+                     explicit_date_start="2025-10-05", explicit_date_end="2025-10-01"), "starts (2025-10-05) after it ends"),
+    (LabelExtraction(date_start_label="past_days", date_end_label="past_days"), "requires a positive days count"),
+])
+def test_validate_extraction(extraction, problem):
+    feedback = label_normalizer._validate_extraction(extraction)
+    
+    if problem is None:
+        assert feedback is None
+    else:
+        assert problem in feedback
+
+
+def test_invalid_extraction_is_retried_on_the_main_model_with_feedback(llm):
+    llm.extractions = [
+        LabelExtraction(date_start_label="past_days", date_end_label="past_days"),
+        LabelExtraction(date_start_label="past_days", date_end_label="past_days", custom_days_count=45),
+    ]
+    
+    state = _normalize("sales for the past 45 days vs previous 45 days")
+    
+    assert [model for model, _ in llm.calls] == ["label-model", "main-model"]
+    assert "No previous feedback (first attempt)." in llm.calls[0][1]
+    assert "Fix the previous issue:** date label 'past_days' requires a positive days count." in llm.calls[1][1]
+    assert state["_custom_days_count"] == 45
+    assert len(label_normalizer._extraction_cache) == 1
+
+
+def test_extraction_that_never_validates_is_not_cached(llm):
+    invalid = LabelExtraction(date_start_label="past_days", date_end_label="past_days")
+    llm.extractions = [invalid, invalid]
+    
+    _normalize("sales for the past 45 days vs previous 45 days")
+    
+    assert len(llm.calls) == label_normalizer._MAX_EXTRACTION_ATTEMPTS
+    assert not label_normalizer._extraction_cache
@@ -0,0 +1,58 @@
+"""
+Golden checks for the label normalizer prompt.
+
+Trimming the prompt must not drop whole rules: every phrasing below has to
+stay covered by a rule line and, where listed, by a worked example. These
+are offline text checks; the LLM-scored golden set is evaluations/subgraph_eval.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.graph.nodes.label_normalizer.node import _format_extraction_prompt
+
+CURRENT_YEAR = 2026
+
+
+@pytest.fixture(scope="module")
+def prompt():
+    return _format_extraction_prompt("placeholder question", CURRENT_YEAR)
+
+
+# (phrasing in the question, expected explicit_date_start)
+GOLDEN_EXPLICIT_DATES = [
+    ("dec 1", f"{CURRENT_YEAR}-12-01"),
+    ("3 jan", f"{CURRENT_YEAR}-01-03"),
+    ("third Jan", f"{CURRENT_YEAR}-01-03"),
+    ("last day of december", f"{CURRENT_YEAR}-12-31"),
+    ("1 Jan 2025", "2025-01-01"),
+]
+
+
+def test_prompt_has_no_unfilled_placeholders(prompt):
+    assert "{" not in prompt and "}" not in prompt
+
+
+def test_current_year_default_rule_is_present(prompt):
+    assert "Explicit dates default to current year" in prompt
+    assert f"If no year is mentioned, use {CURRENT_YEAR}" in prompt
+
+
+@pytest.mark.parametrize("phrase, expected_start", GOLDEN_EXPLICIT_DATES)
+def test_explicit_date_phrasings_are_covered(prompt, phrase, expected_start):
+    assert f'- "{phrase}" → explicit_date + explicit_date_start="{expected_start}"' in prompt
+
+
+@pytest.mark.parametrize("question, expected_start", [
+    ("Show me sales for 3 jan", f"{CURRENT_YEAR}-01-03"),
+    ("Performance on 1 Jan 2025", "2025-01-01"),
+])
+def test_explicit_date_worked_examples(prompt, question, expected_start):
+    example = prompt.split(f'Question: "{question}"', 1)[1].split("**Example", 1)[0]
+    assert '- date_start_label: "explicit_date"' in example
+    assert f'- explicit_date_start: "{expected_start}"' in example
+    assert f'- explicit_date_end: "{expected_start}"' in example
@@ -0,0 +1,119 @@
+"""
+Tests for MathMetricRetriever.get_batched and its per-endpoint fallback.
+
+The HTTP layer is replaced by stubs, so these run offline.
+"""
+
+import asyncio
+import importlib
+import os
+import sys
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import Settings
+from app.context import set_jwt_token_for_task
+
+metrics_api_module = importlib.import_module("app.metricsAccessLayer.metrics_api")
+MathMetricRetriever = metrics_api_module.MathMetricRetriever
+metrics_api = metrics_api_module.metrics_api
+
+ADS_PATH = "/math/v1/math/ads/executive-summary"
+CFO_PATH = "/math/v1/math/cfo/executive-summary"
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Record backend calls; tests set `backend.post` to shape the batch reply."""
+    calls = []
+    
+    async def fake_get(endpoint, params=None, timeout=None):
+        calls.append(("GET", endpoint))
+        return {"endpoint": endpoint}
+    
+    async def fake_post(endpoint, data=None):
+        calls.append(("POST", endpoint))
+        return await state.post(endpoint, data)
+    
+    state = SimpleNamespace(calls=calls, post=None, batch_enabled=True)
+    monkeypatch.setattr(metrics_api.client, "get", fake_get)
+    monkeypatch.setattr(metrics_api.client, "post", fake_post)
+    monkeypatch.setattr(
+        metrics_api_module,
+        "get_settings",
+        lambda: SimpleNamespace(metrics_batch_enabled=state.batch_enabled)
+    )
+    monkeypatch.setattr(MathMetricRetriever, "_batch_supported", True)
+    monkeypatch.setattr(MathMetricRetriever, "_coalesced", {})
+    return state
+
+
+def _status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://backend.test/math/v1/math/batch")
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError(f"{status_code}", request=request, response=response)
+
+
+def _get_batched(endpoints):
+    async def run():
+        set_jwt_token_for_task("test-jwt")
+        return await metrics_api.get_batched(endpoints, "2025-10-01", "2025-10-31")
+    return asyncio.run(run())
+
+
+def test_batch_success_uses_one_call(backend):
+    async def ok(endpoint, data):
+        return {"ads": {"acos": 0.25}, "cfo": {"net_profit": 10}}
+    backend.post = ok
+    
+    result = _get_batched(["ads", "cfo"])
+    
+    assert result == {"ads": {"acos": 0.25}, "cfo": {"net_profit": 10}}
+    assert backend.calls == [("POST", "/math/v1/math/batch")]
+    assert MathMetricRetriever._batch_supported
+
+
+def test_batch_reply_missing_an_endpoint_reports_it_as_failed(backend):
+    async def partial(endpoint, data):
+        return {"ads": {"acos": 0.25}}
+    backend.post = partial
+    
+    result = _get_batched(["ads", "cfo"])
+    
+    assert result["ads"] == {"acos": 0.25}
+    assert isinstance(result["cfo"], LookupError)
+
+
+@pytest.mark.parametrize("error", [
+    _status_error(404),
+    _status_error(503),
+    httpx.ReadTimeout("timed out"),
+])
+def test_batch_failure_falls_back_and_disables_batching(backend, error):
+    async def fail(endpoint, data):
+        raise error
+    backend.post = fail
+    
+    result = _get_batched(["ads", "cfo"])
+    
+    assert result == {"ads": {"endpoint": ADS_PATH}, "cfo": {"endpoint": CFO_PATH}}
+    assert not MathMetricRetriever._batch_supported
+    
+    # The next request skips the failing batch round trip entirely
+    backend.calls.clear()
+    _get_batched(["ads", "cfo"])
+    assert sorted(backend.calls) == [("GET", ADS_PATH), ("GET", CFO_PATH)]
+
+
+def test_batching_is_off_by_default(backend):
+    assert Settings.model_fields["metrics_batch_enabled"].default is False
+    backend.batch_enabled = False
+    
+    result = _get_batched(["ads"])
+    
+    assert result == {"ads": {"endpoint": ADS_PATH}}
+    assert backend.calls == [("GET", ADS_PATH)]
@@ -0,0 +1,73 @@
+"""
+Tests for the metrics query handler's response cache.
+
+Embeddings and the agent are replaced by stubs, so these run offline.
+"""
+
+import asyncio
+import os
+import sys
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.graph.nodes.classifier_route_node.metrics_query_handler import node as metrics_query
+
+
+class _CountingAgent:
+    """Stands in for the metrics agent and answers with the question it saw."""
+    
+    def __init__(self):
+        self.questions = []
+    
+    async def ainvoke(self, payload, config=None):
+        question = payload["messages"][0][1]
+        self.questions.append(question)
+        return {"messages": [SimpleNamespace(content=f"answer to {question}")]}
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    """Every question embeds to the same vector, so only the scope can tell them apart."""
+    async def same_embedding(text):
+        return [1.0, 0.0]
+    
+    stub = _CountingAgent()
+    monkeypatch.setattr(metrics_query._RESPONSE_CACHE, "aembed", same_embedding)
+    monkeypatch.setattr(metrics_query._RESPONSE_CACHE, "_entries", OrderedDict())
+    monkeypatch.setattr(metrics_query, "_get_metrics_agent", lambda model: stub)
+    return stub
+
+
+def _ask(question: str) -> str:
+    state = {
+        "question": question,
+        "_jwt_token": "test-jwt",
+        "date_start": "2025-10-01",
+        "date_end": "2025-10-31",
+    }
+    return asyncio.run(RunnableLambda(metrics_query.metrics_query_handler_node).ainvoke(state))["response"]
+
+
+def test_paraphrase_is_served_from_cache(agent):
+    first = _ask("What's my acos")
+    
+    assert _ask("Show me my acos") == first
+    assert len(agent.questions) == 1
+
+
+@pytest.mark.parametrize("near_miss", [
+    "Why is my acos so high",
+    "How can I improve my acos",
+    "What's my roas",
+    "What's my acos vs 2024",
+])
+def test_near_miss_is_not_served_from_cache(agent, near_miss):
+    _ask("What's my acos")
+    
+    assert _ask(near_miss).startswith(f"answer to Question: {near_miss}")
+    assert len(agent.questions) == 2